@@ -1,5 +1,8 @@
-﻿from typing import Protocol, Any
-import datetime
+﻿from typing import Protocol, Any, Optional, Sequence, Iterator, Callable
+from dataclasses import dataclass
+from array import array
+from collections import deque
+import datetime, csv, json, bisect, itertools, threading, asyncio, time
 
 #region Protocols
 class PropertyChangedListenerProtocol(Protocol):
@@ -83,6 +86,105 @@ class ConsoleLog(PropertyChangedListenerProtocol):
         print(f"!{str(obj)} was edited in: {property_name}")
 #endregion
 
+#region Notifiers
+class _ListenerQueue:
+    def __init__(self, listener: PropertyChangedListenerProtocol) -> None:
+        self.listener = listener
+        self.events: deque[tuple[Any, str]] = deque()
+        self.lock = threading.Lock()
+
+
+class DeferredNotifier:
+    def __init__(self, merge: bool = False) -> None:
+        self.merge = merge
+        self._queues: dict[int, _ListenerQueue] = {}
+        self._pending: set[tuple[int, Any, str]] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(queue.events) for queue in self._queues.values())
+
+    def notify(self, obj: Any, property_name: str, listeners: Sequence[PropertyChangedListenerProtocol]) -> None:
+        with self._lock:
+            for listener in listeners:
+                if self.merge:
+                    key = (id(listener), obj, property_name)
+                    if key in self._pending:
+                        continue
+                    self._pending.add(key)
+                queue = self._queues.get(id(listener))
+                if queue is None:
+                    queue = self._queues[id(listener)] = _ListenerQueue(listener)
+                queue.events.append((obj, property_name))
+        self._wake()
+
+    def flush(self) -> int:
+        delivered = 0
+        with self._lock:
+            queues = list(self._queues.values())
+        for queue in queues:
+            with queue.lock:
+                while True:
+                    with self._lock:
+                        if not queue.events:
+                            break
+                        obj, property_name = queue.events.popleft()
+                        self._pending.discard((id(queue.listener), obj, property_name))
+                    try:
+                        queue.listener.on_property_changed(obj, property_name)
+                    except Exception as e:
+                        print(f"ERROR: {e}")
+                    delivered += 1
+        return delivered
+
+    def _wake(self) -> None:
+        pass
+
+
+class ThreadedNotifier(DeferredNotifier):
+    def __init__(self, merge: bool = False) -> None:
+        DeferredNotifier.__init__(self, merge)
+        self._event = threading.Event()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def close(self) -> None:
+        self._closed = True
+        self._event.set()
+        self._worker.join()
+        self.flush()
+
+    def _wake(self) -> None:
+        self._event.set()
+
+    def _run(self) -> None:
+        while not self._closed:
+            self._event.wait()
+            self._event.clear()
+            self.flush()
+
+
+class AsyncioNotifier(DeferredNotifier):
+    def __init__(self, loop: asyncio.AbstractEventLoop, merge: bool = False) -> None:
+        DeferredNotifier.__init__(self, merge)
+        self.loop = loop
+        self._scheduled = False
+
+    def _wake(self) -> None:
+        with self._lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self.loop.call_soon_threadsafe(self._run)
+
+    def _run(self) -> None:
+        with self._lock:
+            self._scheduled = False
+        self.flush()
+#endregion
+
 #region Test
 class Film(DataChangedProtocol, DataChangingProtocol):
     title: str
@@ -91,6 +193,7 @@ class Film(DataChangedProtocol, DataChangingProtocol):
     
     __data_changed_listeners: list[DataChangedProtocol]
     __data_changing_listeners: list[DataChangingProtocol]
+    _notifier: Optional[DeferredNotifier] = None
 
     def __init__(self, title: str, year: int, rating: float) -> None:
         self.__data_changed_listeners = list()
@@ -152,13 +255,485 @@ class Film(DataChangedProtocol, DataChangingProtocol):
     def _on_property_changing(self, property_name: str, old_value: Any, new_value: Any) -> bool:
         return all(listener.on_property_changing(self, property_name, old_value, new_value) for listener in self.__data_changing_listeners)
 
+    def set_change_notifier(self, notifier: Optional[DeferredNotifier]) -> None:
+        self._notifier = notifier
+
     def _successfully_changed(self, property_name: str) -> None:
+        if self._notifier is not None:
+            self._notifier.notify(self, property_name, self.__data_changed_listeners)
+            return
         for listener in self.__data_changed_listeners: listener.on_property_changed(self, property_name)
 
     def __str__(self):
         return f"\"{self._title}\" ({self._year})"
 #endregion
 
+#region Schemas
+@dataclass(frozen=True)
+class FieldRule:
+    name: str
+    types: tuple[type, ...]
+    type_error: str
+    empty_error: Optional[str] = None
+    min_value: Any = None
+    min_error: str = ""
+    max_value: Any = None
+    max_value_factory: Optional[Callable[[], Any]] = None
+    max_value_ttl: float = 60.0
+    max_error: str = ""
+    same_warning: Optional[str] = None
+
+
+class _CachedBound:
+    def __init__(self, factory: Callable[[], Any], ttl: float) -> None:
+        self.factory = factory
+        self.ttl = ttl
+        self._value = None
+        self._expires = 0.0
+
+    def __call__(self) -> Any:
+        now = time.monotonic()
+        if now >= self._expires:
+            self._value = self.factory()
+            self._expires = now + self.ttl
+        return self._value
+
+
+def compile_setter(rule: FieldRule) -> Callable[[Any, Any], None]:
+    name = rule.name
+    attr = '_' + name
+    types = rule.types
+    type_error = "ERROR: " + rule.type_error
+    empty_error = "ERROR: " + rule.empty_error if rule.empty_error else None
+    min_value, min_error = rule.min_value, "ERROR: " + rule.min_error
+    max_value, max_error = rule.max_value, "ERROR: " + rule.max_error
+    max_bound = _CachedBound(rule.max_value_factory, rule.max_value_ttl) if rule.max_value_factory else None
+    same_warning = "ATTENTION: " + rule.same_warning if rule.same_warning else None
+
+    def setter(self, value: Any) -> None:
+        if not isinstance(value, types):
+            print(type_error)
+            return
+        if empty_error is not None and len(value) == 0:
+            print(empty_error)
+            return
+        if min_value is not None and value < min_value:
+            print(min_error)
+            return
+        if max_value is not None and value > max_value:
+            print(max_error)
+            return
+        if max_bound is not None and value > max_bound():
+            print(max_error)
+            return
+        old_value = getattr(self, attr)
+        if same_warning is not None and old_value == value:
+            print(same_warning)
+        if self._on_property_changing(name, old_value, value)!=True:
+            return
+        setattr(self, attr, value)
+        self._successfully_changed(name)
+    return setter
+
+
+class ValidationSchema:
+    def __init__(self, *rules: FieldRule) -> None:
+        self.rules = rules
+
+    def compile(self, cls: type) -> type:
+        for rule in self.rules:
+            attr = '_' + rule.name
+            setattr(cls, rule.name, property(lambda self, attr=attr: getattr(self, attr), compile_setter(rule)))
+        return cls
+
+
+FILM_SCHEMA = ValidationSchema(
+    FieldRule('title', (str,), "Title is not str",
+              empty_error="No valid title",
+              same_warning="Title was changed to the same value"),
+    FieldRule('year', (int,), "Year is not int",
+              min_value=1896, min_error="First film was released in 1896! Do not try to trick me)",
+              max_value_factory=lambda: datetime.datetime.now().year, max_error="Film was not released yet",
+              same_warning="Year was changed to the same value"),
+    FieldRule('rating', (float, int), "Rating should be float or int",
+              min_value=0, min_error="Film cant be worst than \"The Room\"",
+              max_value=10, max_error="Film cant be better than 10",
+              same_warning="Title changed to the same value"))
+
+
+@FILM_SCHEMA.compile
+class CompiledFilm(Film):
+    pass
+#endregion
+
+#region Benchmarks
+def benchmark_setters(count: int = 100000) -> dict[str, float]:
+    listener_film = Film("Benchmark", 2000, 5.0)
+    for validator in (TitleValidator(), YearValidator(), RatingValidator()):
+        listener_film.add_property_changing_listener(validator)
+    compiled_film = CompiledFilm("Benchmark", 2000, 5.0)
+    titles = ("Benchmark 2", "Benchmark")
+
+    results = {}
+    for name, film in (("listeners", listener_film), ("compiled", compiled_film)):
+        start = time.perf_counter()
+        for i in range(count):
+            film.title = titles[i % 2]
+            film.year = 1900 + i % 100
+            film.rating = i % 10
+        results[name] = (time.perf_counter() - start) / (count * 3) * 1e9
+    return results
+#endregion
+
+#region Catalog
+class FilmView(DataChangedProtocol, DataChangingProtocol):
+    __slots__ = ('_catalog', '_row')
+
+    def __init__(self, catalog: "FilmCatalog", row: int) -> None:
+        self._catalog = catalog
+        self._row = row
+#region Properties
+    @property
+    def title(self) -> str:
+        return self._catalog._titles[self._row]
+
+    @property
+    def year(self) -> int:
+        return self._catalog._years[self._row]
+
+    @property
+    def rating(self) -> float:
+        return self._catalog._ratings[self._row]
+#endregion
+#region Setters
+    @title.setter
+    def title(self, title: str) -> None:
+        self._catalog._set(self, 'title', title)
+
+    @year.setter
+    def year(self, year: int) -> None:
+        self._catalog._set(self, 'year', year)
+
+    @rating.setter
+    def rating(self, rating: float) -> None:
+        self._catalog._set(self, 'rating', rating)
+#endregion
+
+    def add_property_changed_listener(self, listener: PropertyChangedListenerProtocol) -> None:
+        listeners = self._catalog._row_changed_listeners.setdefault(self._row, [])
+        if listener not in listeners: listeners.append(listener)
+
+    def remove_property_changed_listener(self, listener: PropertyChangedListenerProtocol) -> None:
+        listeners = self._catalog._row_changed_listeners.get(self._row, [])
+        if listener in listeners: listeners.remove(listener)
+
+    def add_property_changing_listener(self, listener: PropertyChangingListenerProtocol) -> None:
+        listeners = self._catalog._row_changing_listeners.setdefault(self._row, [])
+        if listener not in listeners: listeners.append(listener)
+
+    def remove_property_changing_listener(self, listener: PropertyChangingListenerProtocol) -> None:
+        listeners = self._catalog._row_changing_listeners.get(self._row, [])
+        if listener in listeners: listeners.remove(listener)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FilmView) and self._catalog is other._catalog and self._row == other._row
+
+    def __hash__(self) -> int:
+        return hash((id(self._catalog), self._row))
+
+    def __str__(self):
+        return f"\"{self.title}\" ({self.year})"
+
+
+class FilmCatalog(DataChangedProtocol, DataChangingProtocol):
+    def __init__(self) -> None:
+        self._titles: list[str] = []
+        self._years = array('i')
+        self._ratings = array('d')
+        self._columns = {'title': self._titles, 'year': self._years, 'rating': self._ratings}
+        self._changed_listeners: list[PropertyChangedListenerProtocol] = []
+        self._changing_listeners: list[PropertyChangingListenerProtocol] = []
+        self._row_changed_listeners: dict[int, list[PropertyChangedListenerProtocol]] = {}
+        self._row_changing_listeners: dict[int, list[PropertyChangingListenerProtocol]] = {}
+        self._notifier: Optional[DeferredNotifier] = None
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    def __getitem__(self, row: int) -> FilmView:
+        if row < 0:
+            row += len(self._titles)
+        if not 0 <= row < len(self._titles):
+            raise IndexError("Film row out of range")
+        return FilmView(self, row)
+
+    def __iter__(self) -> Iterator[FilmView]:
+        for row in range(len(self._titles)):
+            yield FilmView(self, row)
+
+    def append(self, title: str, year: int, rating: float) -> Optional[FilmView]:
+        rejected = self.extend([title], [year], [rating])
+        if rejected:
+            print(f"ERROR: {rejected[0][1]}")
+            return None
+        return FilmView(self, len(self._titles) - 1)
+
+    def extend(self, titles: Sequence, years: Sequence, ratings: Sequence, rows: Optional[Sequence[int]] = None) -> list[tuple[int, str]]:
+        if not len(titles) == len(years) == len(ratings):
+            raise ValueError("Columns must have the same length")
+        rows = rows if rows is not None else range(len(titles))
+
+        errors: dict[int, str] = {}
+        for check, column in ((_check_ratings, ratings), (_check_years, years), (_check_titles, titles)):
+            errors.update(check(column))
+
+        accepted = [i for i in range(len(titles)) if i not in errors]
+        self._titles.extend(titles[i] for i in accepted)
+        self._years.extend(years[i] for i in accepted)
+        self._ratings.extend(ratings[i] for i in accepted)
+        return [(rows[i], errors[i]) for i in sorted(errors)]
+
+    def load_csv(self, file_path: str) -> list[tuple[int, str]]:
+        titles, years, ratings, rows = [], [], [], []
+        try:
+            with open(file_path, 'r', newline='', encoding='utf-8') as file:
+                for line, record in enumerate(csv.DictReader(file), start=2):
+                    titles.append(record.get('title'))
+                    years.append(_parse_number(record.get('year'), int))
+                    ratings.append(_parse_number(record.get('rating'), float))
+                    rows.append(line)
+        except (IOError, csv.Error) as e:
+            print(f"ERROR: {e}")
+            return []
+        return self.extend(titles, years, ratings, rows)
+
+    def load_json(self, file_path: str) -> list[tuple[int, str]]:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as file:
+                records = json.load(file)
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"ERROR: {e}")
+            return []
+        if not isinstance(records, list):
+            print("ERROR: Films file should contain a list of films")
+            return []
+        rows = [i for i, record in enumerate(records) if isinstance(record, dict)]
+        titles = [records[i].get('title') for i in rows]
+        years = [records[i].get('year') for i in rows]
+        ratings = [records[i].get('rating') for i in rows]
+        rejected = [(i, "Film record is not an object") for i, record in enumerate(records) if not isinstance(record, dict)]
+        return sorted(rejected + self.extend(titles, years, ratings, rows))
+
+    def add_property_changed_listener(self, listener: PropertyChangedListenerProtocol) -> None:
+        if listener not in self._changed_listeners: self._changed_listeners.append(listener)
+
+    def remove_property_changed_listener(self, listener: PropertyChangedListenerProtocol) -> None:
+        if listener in self._changed_listeners: self._changed_listeners.remove(listener)
+
+    def add_property_changing_listener(self, listener: PropertyChangingListenerProtocol) -> None:
+        if listener not in self._changing_listeners: self._changing_listeners.append(listener)
+
+    def remove_property_changing_listener(self, listener: PropertyChangingListenerProtocol) -> None:
+        if listener in self._changing_listeners: self._changing_listeners.remove(listener)
+
+    def _set(self, view: FilmView, property_name: str, new_value: Any) -> None:
+        column = self._columns[property_name]
+        if self._on_property_changing(view, property_name, column[view._row], new_value)!=True:
+            return
+        try:
+            column[view._row] = new_value
+        except (TypeError, OverflowError) as e: #typed columns cant hold what Film would accept
+            print(f"ERROR: {_COLUMN_CHECKS[property_name]([new_value]).get(0, e)}")
+            return
+        self._successfully_changed(view, property_name)
+
+    def _on_property_changing(self, view: FilmView, property_name: str, old_value: Any, new_value: Any) -> bool:
+        listeners = self._changing_listeners + self._row_changing_listeners.get(view._row, [])
+        return all(listener.on_property_changing(view, property_name, old_value, new_value) for listener in listeners)
+
+    def set_change_notifier(self, notifier: Optional[DeferredNotifier]) -> None:
+        self._notifier = notifier
+
+    def _successfully_changed(self, view: FilmView, property_name: str) -> None:
+        listeners = self._changed_listeners + self._row_changed_listeners.get(view._row, [])
+        if self._notifier is not None:
+            self._notifier.notify(view, property_name, listeners)
+            return
+        for listener in listeners:
+            listener.on_property_changed(view, property_name)
+
+
+def _parse_number(value: Any, number_type: type) -> Any:
+    try:
+        return number_type(value)
+    except (TypeError, ValueError):
+        return value
+
+#Same rules as the validators above, but checked a whole column at a time
+def _check_titles(titles: Sequence) -> dict[int, str]:
+    errors = {}
+    for i, title in enumerate(titles):
+        if not isinstance(title, str):
+            errors[i] = "Title is not str"
+        elif len(title) == 0:
+            errors[i] = "No valid title"
+    return errors
+
+def _check_years(years: Sequence) -> dict[int, str]:
+    current_year = datetime.datetime.now().year
+    errors = {}
+    for i, year in enumerate(years):
+        if not isinstance(year, int):
+            errors[i] = "Year is not int"
+        elif year < 1896:
+            errors[i] = "First film was released in 1896! Do not try to trick me)"
+        elif year > current_year:
+            errors[i] = "Film was not released yet"
+    return errors
+
+def _check_ratings(ratings: Sequence) -> dict[int, str]:
+    errors = {}
+    for i, rating in enumerate(ratings):
+        if not (isinstance(rating, float) or isinstance(rating, int)):
+            errors[i] = "Rating should be float or int"
+        elif rating < 0:
+            errors[i] = "Film cant be worst than \"The Room\""
+        elif rating > 10:
+            errors[i] = "Film cant be better than 10"
+    return errors
+
+_COLUMN_CHECKS = {'title': _check_titles, 'year': _check_years, 'rating': _check_ratings}
+#endregion
+
+#region Indexes
+class SortedFilmIndex(PropertyChangedListenerProtocol):
+    def __init__(self, property_name: str) -> None:
+        self.property_name = property_name
+        self._keys: list[tuple[Any, int]] = []
+        self._entries: dict[Any, tuple[Any, int]] = {}
+        self._films: dict[int, Any] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, film: DataChangedProtocol) -> None:
+        if film in self._entries:
+            return
+        entry = (getattr(film, self.property_name), next(self._counter))
+        self._insert(entry)
+        self._entries[film] = entry
+        self._films[entry[1]] = film
+        film.add_property_changed_listener(self)
+
+    def remove(self, film: DataChangedProtocol) -> None:
+        entry = self._entries.pop(film, None)
+        if entry is None:
+            return
+        self._discard(entry)
+        del self._films[entry[1]]
+        film.remove_property_changed_listener(self)
+
+    def on_property_changed(self, obj: DataChangedProtocol, property_name: str) -> None:
+        if property_name != self.property_name or obj not in self._entries:
+            return
+        old_entry = self._entries[obj]
+        self._discard(old_entry)
+        entry = (getattr(obj, property_name), old_entry[1])
+        self._insert(entry)
+        self._entries[obj] = entry
+
+    #Films whose value was never set (None) stay subscribed but out of the sorted keys
+    def _insert(self, entry: tuple[Any, int]) -> None:
+        if entry[0] is not None:
+            bisect.insort(self._keys, entry)
+
+    def _discard(self, entry: tuple[Any, int]) -> None:
+        if entry[0] is not None:
+            del self._keys[bisect.bisect_left(self._keys, entry)]
+
+    def range(self, low: Any = None, high: Any = None) -> list[Any]:
+        start = 0 if low is None else bisect.bisect_left(self._keys, (low, -1))
+        stop = len(self._keys) if high is None else bisect.bisect_right(self._keys, (high, float('inf')))
+        return [self._films[seq] for _, seq in self._keys[start:stop]]
+
+    def top(self, k: int) -> list[Any]:
+        return [self._films[seq] for _, seq in reversed(self._keys[max(len(self._keys) - k, 0):])]
+
+
+class HashFilmIndex(PropertyChangedListenerProtocol):
+    def __init__(self, property_name: str) -> None:
+        self.property_name = property_name
+        self._buckets: dict[Any, dict[Any, None]] = {}
+        self._keys: dict[Any, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def add(self, film: DataChangedProtocol) -> None:
+        if film in self._keys:
+            return
+        key = getattr(film, self.property_name)
+        self._buckets.setdefault(key, {})[film] = None
+        self._keys[film] = key
+        film.add_property_changed_listener(self)
+
+    def remove(self, film: DataChangedProtocol) -> None:
+        if film not in self._keys:
+            return
+        self._discard(film, self._keys.pop(film))
+        film.remove_property_changed_listener(self)
+
+    def on_property_changed(self, obj: DataChangedProtocol, property_name: str) -> None:
+        if property_name != self.property_name or obj not in self._keys:
+            return
+        self._discard(obj, self._keys[obj])
+        key = getattr(obj, property_name)
+        self._buckets.setdefault(key, {})[obj] = None
+        self._keys[obj] = key
+
+    def get(self, key: Any) -> list[Any]:
+        return list(self._buckets.get(key, ()))
+
+    def _discard(self, film: Any, key: Any) -> None:
+        bucket = self._buckets[key]
+        del bucket[film]
+        if not bucket:
+            del self._buckets[key]
+
+
+class FilmIndex:
+    def __init__(self, films: Sequence[DataChangedProtocol] = ()) -> None:
+        self._by_title = HashFilmIndex('title')
+        self._by_year = SortedFilmIndex('year')
+        self._by_rating = SortedFilmIndex('rating')
+        for film in films:
+            self.add(film)
+
+    def __len__(self) -> int:
+        return len(self._by_title)
+
+    def add(self, film: DataChangedProtocol) -> None:
+        for index in (self._by_title, self._by_year, self._by_rating):
+            index.add(film)
+
+    def remove(self, film: DataChangedProtocol) -> None:
+        for index in (self._by_title, self._by_year, self._by_rating):
+            index.remove(film)
+
+    def by_title(self, title: str) -> list[Any]:
+        return self._by_title.get(title)
+
+    def by_year(self, low: Optional[int] = None, high: Optional[int] = None) -> list[Any]:
+        return self._by_year.range(low, high)
+
+    def by_rating(self, low: Optional[float] = None, high: Optional[float] = None) -> list[Any]:
+        return self._by_rating.range(low, high)
+
+    def top_rated(self, k: int) -> list[Any]:
+        return self._by_rating.top(k)
+#endregion
+
 #actual code
 film = Film("Wolf from Wall Street", 2013, 8.2)
 
@@ -192,4 +767,50 @@ film.title = "Once upon a time... in Hollywood"
 film.year = 2019
 film.rating = 10
 print()
-print(f"После корректных изменений: {str(film)} {film.rating}/10")
\ No newline at end of file
+print(f"После корректных изменений: {str(film)} {film.rating}/10")
+
+print()
+print("Каталог фильмов")
+catalog = FilmCatalog()
+catalog.add_property_changed_listener(log)
+catalog.add_property_changing_listener(title_validator)
+catalog.add_property_changing_listener(year_validator)
+catalog.add_property_changing_listener(rating_validator)
+rejected = catalog.extend(
+    ["Pulp Fiction", "", "Interstellar", "Avatar 5"],
+    [1994, 2000, 2014, 2031],
+    [8.9, 5, 8.7, 7])
+print(f"Загружено: {len(catalog)}, отклонено: {rejected}")
+catalog[1].rating = 11
+catalog[1].rating = 8.6
+print(f"{str(catalog[1])} {catalog[1].rating}/10")
+
+print()
+print("Индексы")
+index = FilmIndex([film, *catalog])
+print(f"Фильмы 2000-2015: {[str(f) for f in index.by_year(2000, 2015)]}")
+catalog[0].year = 2003
+print(f"Фильмы 2000-2015: {[str(f) for f in index.by_year(2000, 2015)]}")
+print(f"Лучший фильм: {[str(f) for f in index.top_rated(1)]}")
+print(f"Поиск по названию: {[str(f) for f in index.by_title('Interstellar')]}")
+
+print()
+print("Отложенные уведомления")
+notifier = DeferredNotifier(merge=True)
+film.set_change_notifier(notifier)
+film.rating = 9
+film.rating = 9.5
+film.year = 2018
+print(f"В очереди: {len(notifier)}")
+print(f"Доставлено: {notifier.flush()}")
+film.set_change_notifier(None)
+
+print()
+print("Скомпилированная схема")
+compiled_film = CompiledFilm("Pulp Fiction", 1994, 8.9)
+compiled_film.add_property_changed_listener(log)
+compiled_film.year = 2077
+compiled_film.rating = -1
+compiled_film.title = "Pulp Fiction"
+for name, ns in benchmark_setters(20000).items():
+    print(f"{name}: {ns:.0f} нс на присваивание")
\ No newline at end of file
@@ -1,7 +1,14 @@
-﻿from typing import Protocol, TypeVar, Sequence
-from dataclasses import dataclass, field
+﻿from typing import Protocol, TypeVar, Sequence, Any, Callable, Iterator, Iterable
+from dataclasses import dataclass, field, astuple, is_dataclass, replace
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
-import os, json
+import os, sys, json, asyncio, threading, bisect, sqlite3, queue, itertools, random, time, multiprocessing, heapq, secrets, tempfile, tracemalloc, statistics, shutil, hashlib
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
 
 T = TypeVar('T')
 
@@ -48,9 +55,81 @@ class AuthServiceProtocol(Protocol):
     @property
     def current_user(user: User) -> Optional[User]:
         ...
+
+class AsyncDataRepositoryProtocol(Protocol[T]):
+    async def get_all(self) -> Sequence[T]:
+        ...
+    async def get_by_id(self, id: int) -> Optional[T]:
+        ...
+    async def add(self, item: T) -> None:
+        ...
+    async def update(self, item: T) -> None:
+        ...
+    async def delete(self, item: T) -> None:
+        ...
+
+class AsyncUserRepositoryProtocol(AsyncDataRepositoryProtocol[User], Protocol):
+    async def get_by_login(self, login: str) -> Optional[User]:
+        ...
 #endregion
 
-class DataRepository(DataRepositoryProtocol[T]):
+def iter_json_records(file_path: str, chunk_size: int = 1 << 16) -> Iterator[dict]:
+    decoder = json.JSONDecoder()
+    with open(file_path, 'r') as file:
+        buffer, position = file.read(chunk_size), 0
+        while buffer[position:position + 1].isspace():
+            position += 1
+        json_lines = buffer[position:position + 1] != '['
+        position += 0 if json_lines else 1
+        while True:
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position < len(buffer) and buffer[position] == ']' and not json_lines:
+                return
+            try:
+                if position >= len(buffer):
+                    raise json.JSONDecodeError("Need more data", buffer, position)
+                record, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                chunk = file.read(chunk_size)
+                if not chunk:
+                    if position >= len(buffer) and json_lines:
+                        return
+                    raise
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+            yield record
+
+class PagedRepository:
+    #страницы всегда идут по возрастанию id, в памяти не больше page_size записей
+    def iter_all(self, offset: int = 0, limit: Optional[int] = None, after_id: Optional[int] = None,
+                 page_size: int = 10000) -> Iterator[T]:
+        remaining = limit if limit is not None else -1
+        while remaining != 0:
+            records = self._iter_records()
+            if after_id is not None:
+                records = (record for record in records if record['id'] > after_id)
+            page = heapq.nsmallest(page_size, records, key=_record_id)
+            if not page:
+                return
+            after_id = page[-1]['id']
+            if offset >= len(page):
+                offset -= len(page)
+                continue
+            page, offset = page[offset:], 0
+            if remaining > 0:
+                page = page[:remaining]
+                remaining -= len(page)
+            for record in page:
+                yield self.T(**record)
+
+    def get_page(self, offset: int = 0, limit: int = 100, after_id: Optional[int] = None) -> list[T]:
+        return list(self.iter_all(offset=offset, limit=limit, after_id=after_id))
+
+def _record_id(record: dict) -> Any:
+    return record['id']
+
+class DataRepository(PagedRepository, DataRepositoryProtocol[T]):
     def __init__(self, file_path: str, T: type) -> None:
         try:
             with open(file_path, 'r') as file:
@@ -76,10 +155,13 @@ class DataRepository(DataRepositoryProtocol[T]):
         except IOError as e:
             print(f"ERROR: {e}")
 
-    def save_json(self) -> None:
+    def save_json(self, indent: Optional[int] = 2) -> None:
         try:
             with open(self.file_path, 'w') as file:
-                json.dump(self._data, file, indent=2)
+                if indent is None:
+                    file.write(json.dumps(self._data))
+                else:
+                    json.dump(self._data, file, indent=indent)
         except FileNotFoundError:
             print("ERROR: File not found!")
         except PermissionError:
@@ -90,6 +172,15 @@ class DataRepository(DataRepositoryProtocol[T]):
     def get_all(self) -> Sequence[T]:
         return [self.T(**item) for item in self.load_json()]
 
+    def _iter_records(self) -> Iterator[dict]:
+        try:
+            yield from iter_json_records(self.file_path)
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"ERROR: {e}")
+
+    def count(self) -> int:
+        return sum(1 for _ in self._iter_records())
+
     def get_by_id(self, id: int) -> Optional[T]:
         for item in self.load_json():
             if item['id'] == id:
@@ -97,9 +188,28 @@ class DataRepository(DataRepositoryProtocol[T]):
         return None
 
     def add_by_list(self, items: list) -> None:
-        for i in items:
-            if not self.get_by_id(i.id):
-                self.sign_up(i)
+        self.upsert_many(items, update_existing=False)
+
+    def upsert_many(self, items: Sequence[T], update_existing: bool = True,
+                    progress: Optional[Callable[[int, int], None]] = None, progress_every: int = 10000) -> tuple[int, int]:
+        positions = {record['id']: i for i, record in enumerate(self._data)}
+        inserted = updated = 0
+        for done, item in enumerate(items, start=1):
+            position = positions.get(item.id)
+            if position is None:
+                positions[item.id] = len(self._data)
+                self._data.append(dict(item.__dict__))
+                inserted += 1
+            elif update_existing:
+                self._data[position] = dict(item.__dict__)
+                updated += 1
+            if progress and done % progress_every == 0:
+                progress(done, len(items))
+        if inserted or updated:
+            self.save_json(indent=None)
+        if progress:
+            progress(len(items), len(items))
+        return inserted, updated
 
     def sign_up(self, item: T) -> None:
         if self.get_by_id(item.id):
@@ -115,13 +225,541 @@ class DataRepository(DataRepositoryProtocol[T]):
         self.save_json()
 
     def delete(self, item: T) -> None:
-        self._data = [elem for elem in self._data if elem[id] != item.id]
-        self.save_json(self._data)
+        self._data = [elem for elem in self._data if elem['id'] != item.id]
+        self.save_json()
 
     def show_data(self) -> None:
         for item in self._data:
             print(item)
 
+_STR_RANK = 3
+
+def _sort_key(value: Any) -> tuple[int, Any]:
+    if value is None or value is False: #в данных False означает "не указано"
+        return (0, 0)
+    if value is True:
+        return (1, 1)
+    if isinstance(value, (int, float)):
+        return (2, value)
+    if isinstance(value, str):
+        return (_STR_RANK, value.lower())
+    return (4, str(value))
+
+class CachedDataRepository(DataRepository[T]):
+    def __init__(self, file_path: str, T: type, index_fields: Sequence[str] = ('id',),
+                 secondary_fields: Sequence[str] = (), sorted_fields: Sequence[str] = ()) -> None:
+        self.index_fields = tuple(dict.fromkeys(('id', *index_fields)))
+        self._indexes: dict[str, dict[Any, dict]] = {field: {} for field in self.index_fields}
+        self._secondary: dict[str, dict[Any, dict[Any, dict]]] = {field: {} for field in secondary_fields}
+        self._sorted: dict[str, list[tuple[tuple[int, Any], Any]]] = {field: [] for field in sorted_fields}
+        self._signature = None
+        DataRepository.__init__(self, file_path=file_path, T=T)
+        self._refresh()
+
+    def _file_signature(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = os.stat(self.file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self) -> None:
+        signature = self._file_signature()
+        if signature == self._signature:
+            return
+        self._signature = signature
+        self._data = self.load_json() or []
+        for index in (*self._indexes.values(), *self._secondary.values()):
+            index.clear()
+        for record in self._data:
+            self._index_record(record, with_sorted=False)
+        self._rebuild_sorted()
+
+    def _rebuild_sorted(self) -> None:
+        for field in self._sorted:
+            self._sorted[field] = sorted((_sort_key(record.get(field)), record['id']) for record in self._data)
+
+    def _index_record(self, record: dict, with_sorted: bool = True) -> None:
+        for field, index in self._indexes.items():
+            index[record.get(field)] = record
+        for field, index in self._secondary.items():
+            index.setdefault(record.get(field), {})[record['id']] = record
+        if with_sorted:
+            for field, keys in self._sorted.items():
+                bisect.insort(keys, (_sort_key(record.get(field)), record['id']))
+
+    def _unindex_record(self, record: dict, with_sorted: bool = True) -> None:
+        for field, index in self._indexes.items():
+            if index.get(record.get(field)) is record:
+                del index[record.get(field)]
+        for field, index in self._secondary.items():
+            bucket = index.get(record.get(field), {})
+            bucket.pop(record['id'], None)
+            if not bucket:
+                index.pop(record.get(field), None)
+        if with_sorted:
+            for field, keys in self._sorted.items():
+                position = bisect.bisect_left(keys, (_sort_key(record.get(field)), record['id']))
+                if position < len(keys) and keys[position][1] == record['id']:
+                    del keys[position]
+
+    def save_json(self, indent: Optional[int] = 2) -> None:
+        DataRepository.save_json(self, indent=indent)
+        self._signature = self._file_signature()
+
+    def upsert_many(self, items: Sequence[T], update_existing: bool = True,
+                    progress: Optional[Callable[[int, int], None]] = None, progress_every: int = 10000) -> tuple[int, int]:
+        self._refresh()
+        ids = self._indexes['id']
+        inserted = updated = 0
+        for done, item in enumerate(items, start=1):
+            record = ids.get(item.id)
+            if record is None:
+                record = dict(item.__dict__)
+                self._data.append(record)
+                self._index_record(record, with_sorted=False)
+                inserted += 1
+            elif update_existing:
+                self._unindex_record(record, with_sorted=False)
+                record.clear()
+                record.update(item.__dict__)
+                self._index_record(record, with_sorted=False)
+                updated += 1
+            if progress and done % progress_every == 0:
+                progress(done, len(items))
+        if inserted or updated:
+            self._rebuild_sorted()
+            self.save_json(indent=None)
+        if progress:
+            progress(len(items), len(items))
+        return inserted, updated
+
+    def get_all(self) -> Sequence[T]:
+        self._refresh()
+        return [self.T(**item) for item in self._data]
+
+    def get_by_id(self, id: int) -> Optional[T]:
+        return self.get_by_field('id', id)
+
+    def get_by_field(self, field: str, value: Any) -> Optional[T]:
+        self._refresh()
+        record = self._indexes[field].get(value)
+        return self.T(**record) if record is not None else None
+
+    def find_by(self, field: str, value: Any) -> list[T]:
+        self._refresh()
+        return self._find_by(field, value)
+
+    def sorted_by(self, field: str, reverse: bool = False, limit: Optional[int] = None) -> list[T]:
+        self._refresh()
+        return self._sorted_by(field, reverse, limit)
+
+    def range_by(self, field: str, low: Any = None, high: Any = None,
+                 limit: Optional[int] = None) -> list[T]:
+        self._refresh()
+        return self._range_by(field, low, high, limit)
+
+    def prefix_by(self, field: str, prefix: str, limit: Optional[int] = None) -> list[T]:
+        self._refresh()
+        return self._prefix_by(field, prefix, limit)
+
+    def _find_by(self, field: str, value: Any) -> list[T]:
+        return [self.T(**record) for record in self._secondary[field].get(value, {}).values()]
+
+    def _sorted_by(self, field: str, reverse: bool, limit: Optional[int]) -> list[T]:
+        keys = reversed(self._sorted[field]) if reverse else iter(self._sorted[field])
+        return self._records_for(itertools.islice(keys, limit))
+
+    def _range_by(self, field: str, low: Any, high: Any, limit: Optional[int]) -> list[T]:
+        keys = self._sorted[field]
+        start = bisect.bisect_left(keys, (_sort_key(low), )) if low is not None else 0
+        stop = bisect.bisect_right(keys, (_sort_key(high), float('inf'))) if high is not None else len(keys)
+        return self._records_for(keys[start:stop if limit is None else min(stop, start + limit)])
+
+    def _prefix_by(self, field: str, prefix: str, limit: Optional[int]) -> list[T]:
+        keys = self._sorted[field]
+        prefix = prefix.lower()
+        start = bisect.bisect_left(keys, ((_STR_RANK, prefix), ))
+        matches = itertools.takewhile(lambda key: key[0][0] == _STR_RANK and key[0][1].startswith(prefix),
+                                      (keys[i] for i in range(start, len(keys))))
+        return self._records_for(itertools.islice(matches, limit))
+
+    def _records_for(self, keys: Iterable[tuple[tuple[int, Any], Any]]) -> list[T]:
+        ids = self._indexes['id']
+        return [self.T(**ids[id]) for _, id in keys]
+
+    def sign_up(self, item: T) -> None:
+        self._refresh()
+        if item.id in self._indexes['id']:
+            return
+        record = dict(item.__dict__)
+        self._data.append(record)
+        self._index_record(record)
+        self.save_json()
+
+    def update(self, item: T) -> None:
+        self._refresh()
+        record = self._indexes['id'].get(item.id)
+        if record is None:
+            return
+        self._unindex_record(record)
+        record.clear()
+        record.update(item.__dict__)
+        self._index_record(record)
+        self.save_json()
+
+    def delete(self, item: T) -> None:
+        self._refresh()
+        record = self._indexes['id'].get(item.id)
+        if record is None:
+            return
+        self._unindex_record(record)
+        self._data = [elem for elem in self._data if elem is not record]
+        self.save_json()
+
+class ReadWriteLock:
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self):
+        with self._condition:
+            while self._writer or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._readers -= 1
+                if not self._readers:
+                    self._condition.notify_all()
+
+    @contextmanager
+    def write(self):
+        with self._condition:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._writer = False
+                self._condition.notify_all()
+
+@contextmanager
+def file_lock(lock_path: str, exclusive: bool):
+    with open(lock_path, 'a+') as file:
+        if fcntl:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        else:
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+            else:
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+
+class ConcurrentDataRepository(CachedDataRepository[T]):
+    def __init__(self, file_path: str, T: type, index_fields: Sequence[str] = ('id',),
+                 secondary_fields: Sequence[str] = (), sorted_fields: Sequence[str] = ()) -> None:
+        self._rw_lock = ReadWriteLock()
+        self.lock_path = file_path + '.lock'
+        CachedDataRepository.__init__(self, file_path=file_path, T=T, index_fields=index_fields,
+                                      secondary_fields=secondary_fields, sorted_fields=sorted_fields)
+
+    @contextmanager
+    def _reading(self):
+        if self._file_signature() != self._signature:
+            with self._rw_lock.write(), file_lock(self.lock_path, exclusive=False):
+                CachedDataRepository._refresh(self)
+        with self._rw_lock.read():
+            yield
+
+    @contextmanager
+    def _writing(self):
+        with self._rw_lock.write(), file_lock(self.lock_path, exclusive=True):
+            yield
+
+    def save_json(self, indent: Optional[int] = 2) -> None:
+        tmp_path = f"{self.file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w') as file:
+                file.write(json.dumps(self._data, indent=indent))
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.file_path)
+        except IOError as e:
+            print(f"ERROR: {e}")
+        self._signature = self._file_signature()
+
+    def get_all(self) -> Sequence[T]:
+        with self._reading():
+            return [self.T(**item) for item in self._data]
+
+    def _iter_records(self) -> Iterator[dict]:
+        with self._reading():
+            records = list(self._data)
+        return iter(records)
+
+    def count(self) -> int:
+        with self._reading():
+            return len(self._data)
+
+    def get_by_field(self, field: str, value: Any) -> Optional[T]:
+        with self._reading():
+            record = self._indexes[field].get(value)
+            return self.T(**record) if record is not None else None
+
+    def find_by(self, field: str, value: Any) -> list[T]:
+        with self._reading():
+            return self._find_by(field, value)
+
+    def sorted_by(self, field: str, reverse: bool = False, limit: Optional[int] = None) -> list[T]:
+        with self._reading():
+            return self._sorted_by(field, reverse, limit)
+
+    def range_by(self, field: str, low: Any = None, high: Any = None,
+                 limit: Optional[int] = None) -> list[T]:
+        with self._reading():
+            return self._range_by(field, low, high, limit)
+
+    def prefix_by(self, field: str, prefix: str, limit: Optional[int] = None) -> list[T]:
+        with self._reading():
+            return self._prefix_by(field, prefix, limit)
+
+    def sign_up(self, item: T) -> None:
+        with self._writing():
+            CachedDataRepository.sign_up(self, item)
+
+    def update(self, item: T) -> None:
+        with self._writing():
+            CachedDataRepository.update(self, item)
+
+    def delete(self, item: T) -> None:
+        with self._writing():
+            CachedDataRepository.delete(self, item)
+
+    def upsert_many(self, items: Sequence[T], update_existing: bool = True,
+                    progress: Optional[Callable[[int, int], None]] = None, progress_every: int = 10000) -> tuple[int, int]:
+        with self._writing():
+            return CachedDataRepository.upsert_many(self, items, update_existing, progress, progress_every)
+
+    def show_data(self) -> None:
+        for item in self.get_all():
+            print(item)
+
+class JournalRepository(PagedRepository, DataRepositoryProtocol[T]):
+    def __init__(self, file_path: str, T: type, index_fields: Sequence[str] = ('id',),
+                 fsync_every: int = 64, compact_after: int = 10000) -> None:
+        self.file_path = file_path
+        self.journal_path = file_path + '.journal'
+        self.T = T
+        self.fsync_every = fsync_every
+        self.compact_after = compact_after
+        self._records: dict[Any, dict] = {}
+        self._indexes: dict[str, dict[Any, Any]] = {field: {} for field in index_fields if field != 'id'}
+        self._lock = threading.RLock()
+        self._unsynced = 0
+        self._journal_records = 0
+        self._compactor: Optional[threading.Thread] = None
+        self._replay()
+        self._journal = open(self.journal_path, 'a', encoding='utf-8')
+
+    def _replay(self) -> None:
+        try:
+            with open(self.file_path, 'r') as file:
+                for record in json.load(file):
+                    self._apply('add', record)
+        except FileNotFoundError:
+            pass
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"ERROR: {e}")
+        for path in (self.journal_path + '.old', self.journal_path):
+            try:
+                with open(path, 'rb') as file:
+                    good = 0
+                    for line in file:
+                        try:
+                            if not line.endswith(b'\n'):
+                                raise ValueError("incomplete line")
+                            entry = json.loads(line)
+                        except ValueError:
+                            break #недописанная запись после сбоя
+                        self._apply(entry['op'], entry['item'])
+                        self._journal_records += 1
+                        good += len(line)
+                if good < os.path.getsize(path):
+                    os.truncate(path, good) #иначе следующие записи склеятся с обрывком
+            except FileNotFoundError:
+                pass
+
+    def _apply(self, op: str, record: dict) -> None:
+        old = self._records.pop(record['id'], None)
+        if old is not None:
+            for field, index in self._indexes.items():
+                if index.get(old.get(field)) == old['id']:
+                    del index[old.get(field)]
+        if op == 'delete':
+            return
+        self._records[record['id']] = record
+        for field, index in self._indexes.items():
+            index[record.get(field)] = record['id']
+
+    def _write(self, op: str, record: dict) -> None:
+        with self._lock:
+            self._apply(op, record)
+            try:
+                self._journal.write(json.dumps({'op': op, 'item': record}) + '\n')
+                self._journal.flush()
+                self._unsynced += 1
+                if self._unsynced >= self.fsync_every:
+                    self.sync()
+            except IOError as e:
+                print(f"ERROR: {e}")
+            self._journal_records += 1
+            if self._journal_records >= self.compact_after:
+                self.compact()
+
+    def sync(self) -> None:
+        with self._lock:
+            if self._unsynced:
+                os.fsync(self._journal.fileno())
+                self._unsynced = 0
+
+    def compact(self, wait: bool = False) -> None:
+        with self._lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                return
+            self.sync()
+            old_path = self.journal_path + '.old'
+            if os.path.exists(old_path): #остался от прерванного сжатия
+                self._write_snapshot(list(self._records.values()))
+                if os.path.exists(old_path):
+                    return
+            self._journal.close()
+            os.replace(self.journal_path, old_path)
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+            self._journal_records = 0
+            snapshot = list(self._records.values())
+            self._compactor = threading.Thread(target=self._write_snapshot, args=(snapshot,), daemon=True)
+            self._compactor.start()
+        if wait:
+            self._compactor.join()
+
+    def _write_snapshot(self, snapshot: list[dict]) -> None:
+        tmp_path = self.file_path + '.tmp'
+        try:
+            with open(tmp_path, 'w') as file:
+                json.dump(snapshot, file)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(tmp_path, self.file_path)
+            os.remove(self.journal_path + '.old')
+        except IOError as e:
+            print(f"ERROR: {e}")
+
+    def close(self) -> None:
+        with self._lock:
+            self.sync()
+            self._journal.close()
+        if self._compactor is not None:
+            self._compactor.join()
+
+    def get_all(self) -> Sequence[T]:
+        with self._lock:
+            return [self.T(**item) for item in self._records.values()]
+
+    def _iter_records(self) -> Iterator[dict]:
+        with self._lock:
+            records = list(self._records.values())
+        return iter(records)
+
+    def count(self) -> int:
+        return len(self._records)
+
+    def get_by_id(self, id: int) -> Optional[T]:
+        record = self._records.get(id)
+        return self.T(**record) if record is not None else None
+
+    def get_by_field(self, field: str, value: Any) -> Optional[T]:
+        id = self._indexes[field].get(value)
+        return self.get_by_id(id) if id is not None else None
+
+    def add(self, item: T) -> None:
+        self.sign_up(item)
+
+    def add_by_list(self, items: list) -> None:
+        self.upsert_many(items, update_existing=False)
+
+    def upsert_many(self, items: Sequence[T], update_existing: bool = True,
+                    progress: Optional[Callable[[int, int], None]] = None, progress_every: int = 10000) -> tuple[int, int]:
+        inserted = updated = 0
+        with self._lock:
+            lines = []
+            for done, item in enumerate(items, start=1):
+                if item.id not in self._records:
+                    op = 'add'
+                    inserted += 1
+                elif update_existing:
+                    op = 'update'
+                    updated += 1
+                else:
+                    op = None
+                if progress and done % progress_every == 0:
+                    progress(done, len(items))
+                if op is None:
+                    continue
+                record = dict(item.__dict__)
+                self._apply(op, record)
+                lines.append(json.dumps({'op': op, 'item': record}))
+            if lines:
+                try:
+                    self._journal.write('\n'.join(lines) + '\n')
+                    self._journal.flush()
+                    self._unsynced += len(lines)
+                    self.sync()
+                except IOError as e:
+                    print(f"ERROR: {e}")
+                self._journal_records += len(lines)
+                if self._journal_records >= self.compact_after:
+                    self.compact()
+        if progress:
+            progress(len(items), len(items))
+        return inserted, updated
+
+    def sign_up(self, item: T) -> None:
+        with self._lock:
+            if item.id in self._records:
+                return
+            self._write('add', dict(item.__dict__))
+
+    def update(self, item: T) -> None:
+        with self._lock:
+            if item.id not in self._records:
+                return
+            self._write('update', dict(item.__dict__))
+
+    def delete(self, item: T) -> None:
+        with self._lock:
+            if item.id not in self._records:
+                return
+            self._write('delete', {'id': item.id})
+
+    def show_data(self) -> None:
+        for item in self._records.values():
+            print(item)
+
 class UserRepository(DataRepository[User], UserRepositoryProtocol):
     def __init__(self, file_path: str) -> None:
         DataRepository.__init__(self, file_path = file_path, T=User)
@@ -132,6 +770,209 @@ class UserRepository(DataRepository[User], UserRepositoryProtocol):
                 return User(**item)
         return None
 
+class CachedUserRepository(CachedDataRepository[User], UserRepositoryProtocol):
+    def __init__(self, file_path: str) -> None:
+        CachedDataRepository.__init__(self, file_path=file_path, T=User, index_fields=('id', 'login'),
+                                      secondary_fields=('email',), sorted_fields=('name',))
+
+    def get_by_login(self, login: str) -> Optional[User]:
+        return self.get_by_field('login', login)
+
+class ConcurrentUserRepository(ConcurrentDataRepository[User], UserRepositoryProtocol):
+    def __init__(self, file_path: str) -> None:
+        ConcurrentDataRepository.__init__(self, file_path=file_path, T=User, index_fields=('id', 'login'),
+                                          secondary_fields=('email',), sorted_fields=('name',))
+
+    def get_by_login(self, login: str) -> Optional[User]:
+        return self.get_by_field('login', login)
+
+class JournalUserRepository(JournalRepository[User], UserRepositoryProtocol):
+    def __init__(self, file_path: str, **options) -> None:
+        JournalRepository.__init__(self, file_path=file_path, T=User, index_fields=('id', 'login'), **options)
+
+    def get_by_login(self, login: str) -> Optional[User]:
+        return self.get_by_field('login', login)
+
+class SqliteConnectionPool:
+    def __init__(self, db_path: str, size: int = 4) -> None:
+        self.db_path = db_path
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._all: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        with self._lock:
+            self._all.append(connection)
+        return connection
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        try:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self._connect()
+            try:
+                yield connection
+            finally:
+                self._idle.put(connection)
+        finally:
+            self._slots.release()
+
+    def close(self) -> None:
+        with self._lock:
+            for connection in self._all:
+                connection.close()
+            self._all.clear()
+
+class SqliteUserRepository(UserRepositoryProtocol):
+    FIELDS = ('id', 'name', 'login', 'password', 'email', 'address')
+    SELECT = "SELECT id, name, login, password, email, address FROM users"
+    SELECT_BY_ID = SELECT + " WHERE id = ?"
+    SELECT_BY_LOGIN = SELECT + " WHERE login = ?"
+    INSERT = ("INSERT INTO users (id, name, login, password, email, address) VALUES (?, ?, ?, ?, ?, ?) "
+              "ON CONFLICT(id) DO NOTHING")
+    UPSERT = ("INSERT INTO users (id, name, login, password, email, address) VALUES (?, ?, ?, ?, ?, ?) "
+              "ON CONFLICT(id) DO UPDATE SET name=excluded.name, login=excluded.login, password=excluded.password, "
+              "email=excluded.email, address=excluded.address")
+    UPDATE = "UPDATE users SET name = ?, login = ?, password = ?, email = ?, address = ? WHERE id = ?"
+    DELETE = "DELETE FROM users WHERE id = ?"
+
+    def __init__(self, db_path: str, pool_size: int = 4) -> None:
+        self.pool = SqliteConnectionPool(db_path, pool_size)
+        with self.pool.connection() as connection, connection:
+            connection.execute("CREATE TABLE IF NOT EXISTS users ("
+                               "id INTEGER PRIMARY KEY, name TEXT NOT NULL, login TEXT NOT NULL UNIQUE, "
+                               "password TEXT NOT NULL, email TEXT, address TEXT)")
+
+    @staticmethod
+    def _to_row(item: User) -> tuple:
+        return tuple(value if value is not False else None for value in astuple(item))
+
+    @staticmethod
+    def _to_user(row: Optional[tuple]) -> Optional[User]:
+        if row is None:
+            return None
+        return User(*(value if value is not None else False for value in row))
+
+    def get_all(self) -> Sequence[User]:
+        with self.pool.connection() as connection:
+            return [self._to_user(row) for row in connection.execute(self.SELECT + " ORDER BY id")]
+
+    def iter_all(self, offset: int = 0, limit: Optional[int] = None, after_id: Optional[int] = None,
+                 page_size: int = 1000) -> Iterator[User]:
+        remaining = limit if limit is not None else -1
+        while remaining != 0:
+            size = page_size if remaining < 0 else min(page_size, remaining)
+            with self.pool.connection() as connection:
+                if after_id is None:
+                    rows = connection.execute(self.SELECT + " ORDER BY id LIMIT ? OFFSET ?", (size, offset)).fetchall()
+                else:
+                    rows = connection.execute(self.SELECT + " WHERE id > ? ORDER BY id LIMIT ? OFFSET ?",
+                                              (after_id, size, offset)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield self._to_user(row)
+            after_id, offset = rows[-1][0], 0
+            remaining -= len(rows) if remaining > 0 else 0
+
+    def get_page(self, offset: int = 0, limit: int = 100, after_id: Optional[int] = None) -> list[User]:
+        return list(self.iter_all(offset=offset, limit=limit, after_id=after_id, page_size=limit))
+
+    def count(self) -> int:
+        with self.pool.connection() as connection:
+            return connection.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+
+    def get_by_id(self, id: int) -> Optional[User]:
+        with self.pool.connection() as connection:
+            return self._to_user(connection.execute(self.SELECT_BY_ID, (id,)).fetchone())
+
+    def get_by_login(self, login: str) -> Optional[User]:
+        with self.pool.connection() as connection:
+            return self._to_user(connection.execute(self.SELECT_BY_LOGIN, (login,)).fetchone())
+
+    def add(self, item: User) -> None:
+        self.sign_up(item)
+
+    def sign_up(self, item: User) -> None:
+        try:
+            with self.pool.connection() as connection, connection:
+                connection.execute(self.INSERT, self._to_row(item))
+        except sqlite3.Error as e:
+            print(f"ERROR: {e}")
+
+    def add_by_list(self, items: list) -> None:
+        self.upsert_many(items, update_existing=False)
+
+    def upsert_many(self, items: Sequence[User], update_existing: bool = True,
+                    progress: Optional[Callable[[int, int], None]] = None, progress_every: int = 10000) -> tuple[int, int]:
+        statement = self.UPSERT if update_existing else self.INSERT
+        try:
+            with self.pool.connection() as connection, connection:
+                before = connection.execute("SELECT COUNT(*) FROM users").fetchone()[0]
+                for start in range(0, len(items), progress_every):
+                    connection.executemany(statement, (self._to_row(item) for item in items[start:start + progress_every]))
+                    if progress:
+                        progress(min(start + progress_every, len(items)), len(items))
+                inserted = connection.execute("SELECT COUNT(*) FROM users").fetchone()[0] - before
+        except sqlite3.Error as e:
+            print(f"ERROR: {e}")
+            return 0, 0
+        return inserted, len(items) - inserted if update_existing else 0
+
+    def update(self, item: User) -> None:
+        row = self._to_row(item)
+        try:
+            with self.pool.connection() as connection, connection:
+                connection.execute(self.UPDATE, row[1:] + row[:1])
+        except sqlite3.Error as e:
+            print(f"ERROR: {e}")
+
+    def delete(self, item: User) -> None:
+        try:
+            with self.pool.connection() as connection, connection:
+                connection.execute(self.DELETE, (item.id,))
+        except sqlite3.Error as e:
+            print(f"ERROR: {e}")
+
+    def show_data(self) -> None:
+        for item in self.get_all():
+            print(item)
+
+    def close(self) -> None:
+        self.pool.close()
+
+def migrate_json_to_sqlite(json_path: str, db_path: str,
+                           progress: Optional[Callable[[int, int], None]] = None) -> int:
+    try:
+        with open(json_path, 'r') as file:
+            records = json.load(file)
+    except (IOError, json.JSONDecodeError) as e:
+        print(f"ERROR: {e}")
+        return 0
+    repository = SqliteUserRepository(db_path)
+    try:
+        with repository.pool.connection() as connection:
+            owners = dict(connection.execute("SELECT login, id FROM users").fetchall())
+        users = []
+        for record in records:
+            user = User(**record)
+            owner = owners.setdefault(user.login, user.id)
+            if owner != user.id: #в JSON логины не уникальны, в таблице уникальны
+                print(f"ERROR: User {user.id} skipped, login '{user.login}' belongs to user {owner}")
+                continue
+            users.append(user)
+        inserted, _ = repository.upsert_many(users, progress=progress)
+    finally:
+        repository.close()
+    return inserted
+
 class AuthService(AuthServiceProtocol):
     def __init__(self, user_repo: UserRepositoryProtocol, session_file: str) -> None:
         self.session_file = session_file
@@ -180,53 +1021,477 @@ class AuthService(AuthServiceProtocol):
     def current_user(self) -> Optional[User]:
         return self._current_user
 
+def _session_fingerprint(token: str, user: User) -> str:
+    return hashlib.sha256(f"{token}:{user.password}".encode()).hexdigest()
+
+class SessionStore:
+    def __init__(self, user_repo: UserRepositoryProtocol, snapshot_file: Optional[str] = None, ttl: float = 1800.0,
+                 snapshot_interval: Optional[float] = None) -> None:
+        self.user_repo = user_repo
+        self.snapshot_file = snapshot_file
+        self.ttl = ttl
+        self._sessions: dict[str, list] = {} #token -> [user, fingerprint, expires_at]
+        self._expiry_heap: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._snapshotter: Optional[threading.Thread] = None
+        if snapshot_file:
+            self.load()
+        if snapshot_file and snapshot_interval:
+            self._snapshotter = threading.Thread(target=self._snapshot_loop, args=(snapshot_interval,), daemon=True)
+            self._snapshotter.start()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def create(self, user: User) -> str:
+        token = secrets.token_urlsafe(32)
+        expires_at = time.time() + self.ttl
+        with self._lock:
+            self._sessions[token] = [user, _session_fingerprint(token, user), expires_at]
+            heapq.heappush(self._expiry_heap, (expires_at, token))
+        return token
+
+    def get(self, token: str) -> Optional[User]:
+        now = time.time()
+        with self._lock:
+            self._purge(now)
+            session = self._sessions.get(token)
+            if session is None:
+                return None
+            session[2] = now + self.ttl
+            return session[0]
+
+    def delete(self, token: str) -> None:
+        with self._lock:
+            self._sessions.pop(token, None)
+
+    def purge_expired(self) -> None:
+        with self._lock:
+            self._purge(time.time())
+
+    def _purge(self, now: float) -> None:
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, token = heapq.heappop(self._expiry_heap)
+            session = self._sessions.get(token)
+            if session is None:
+                continue
+            if session[2] > now:
+                heapq.heappush(self._expiry_heap, (session[2], token))
+            else:
+                del self._sessions[token]
+
+    def save(self) -> None:
+        with self._lock:
+            self._purge(time.time())
+            snapshot = {token: {'user_id': user.id, 'fingerprint': fingerprint, 'expires_at': expires_at}
+                        for token, (user, fingerprint, expires_at) in self._sessions.items()}
+        tmp_path = self.snapshot_file + '.tmp'
+        try:
+            with open(tmp_path, 'w') as file:
+                json.dump(snapshot, file)
+            os.replace(tmp_path, self.snapshot_file)
+        except IOError as e:
+            print(f"ERROR: {e}")
+
+    def load(self) -> None:
+        try:
+            with open(self.snapshot_file, 'r') as file:
+                snapshot = json.load(file)
+        except FileNotFoundError:
+            return
+        except (IOError, json.JSONDecodeError) as e:
+            print(f"ERROR: {e}")
+            return
+        now = time.time()
+        for token, session in snapshot.items():
+            if session.get('expires_at', 0) <= now or 'user_id' not in session:
+                continue
+            user = self.user_repo.get_by_id(session['user_id']) #смена пароля или удаление закрывают сессию
+            if user is None or _session_fingerprint(token, user) != session.get('fingerprint'):
+                continue
+            with self._lock:
+                self._sessions[token] = [user, session['fingerprint'], session['expires_at']]
+                heapq.heappush(self._expiry_heap, (session['expires_at'], token))
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._snapshotter is not None:
+            self._snapshotter.join()
+        if self.snapshot_file:
+            self.save()
+
+    def _snapshot_loop(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.save()
+
+class SessionAuthService:
+    def __init__(self, user_repo: UserRepositoryProtocol, session_store: SessionStore) -> None:
+        self.user_repo = user_repo
+        self.sessions = session_store
+
+    def sign_in(self, login: str, password: str) -> Optional[str]:
+        user = self.user_repo.get_by_login(login)
+        if user and user.password == password:
+            return self.sessions.create(user)
+        return None
+
+    def sign_out(self, token: str) -> None:
+        self.sessions.delete(token)
+
+    def is_authorized(self, token: str) -> bool:
+        return self.sessions.get(token) != None
+
+    def current_user(self, token: str) -> Optional[User]:
+        return self.sessions.get(token)
+
+class AsyncRepository(AsyncDataRepositoryProtocol[T]):
+    def __init__(self, repo: DataRepositoryProtocol[T], max_workers: int = 4) -> None:
+        self.repo = repo
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._rw_lock = ReadWriteLock()
+        #остальные репозитории меняют свой кэш и при чтении
+        thread_safe = isinstance(repo, (ConcurrentDataRepository, JournalRepository, SqliteUserRepository))
+        self._read_lock = self._rw_lock.read if thread_safe else self._rw_lock.write
+        self._in_flight: dict[tuple, asyncio.Future] = {}
+        self._generation = 0
+
+    def _call(self, lock: Callable, method: str, *args: Any) -> Any:
+        with lock():
+            return getattr(self.repo, method)(*args)
+
+    async def _read(self, method: str, *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        key = (loop, self._generation, method, args)
+        future = self._in_flight.get(key)
+        if future is None:
+            future = loop.run_in_executor(self.executor, self._call, self._read_lock, method, *args)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            return await asyncio.shield(future)
+        return _copy_result(await asyncio.shield(future))
+
+    async def _write(self, method: str, *args: Any) -> Any:
+        self._generation += 1 #чтения после записи не присоединяются к уже начатым
+        return await self.offload(self._call, self._rw_lock.write, method, *args)
+
+    async def offload(self, function: Callable, *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    async def get_all(self) -> Sequence[T]:
+        return await self._read('get_all')
+
+    async def get_by_id(self, id: int) -> Optional[T]:
+        return await self._read('get_by_id', id)
+
+    async def add(self, item: T) -> None:
+        await self._write('sign_up', item)
+
+    async def sign_up(self, item: T) -> None:
+        await self._write('sign_up', item)
+
+    async def update(self, item: T) -> None:
+        await self._write('update', item)
+
+    async def delete(self, item: T) -> None:
+        await self._write('delete', item)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+
+def _copy_result(result: Any) -> Any:
+    if isinstance(result, list):
+        return [_copy_result(item) for item in result]
+    if is_dataclass(result) and not isinstance(result, type):
+        return replace(result)
+    return result
+
+class AsyncUserRepository(AsyncRepository[User], AsyncUserRepositoryProtocol):
+    async def get_by_login(self, login: str) -> Optional[User]:
+        return await self._read('get_by_login', login)
+
+class AsyncAuthService:
+    def __init__(self, user_repo: AsyncUserRepository, session_file: str) -> None:
+        self.session_file = session_file
+        self.user_repo = user_repo
+        self._current_user: Optional[User] = None
+
+    async def start_session(self) -> None:
+        session = await self.user_repo.offload(_read_session, self.session_file)
+        self._current_user = await self.user_repo.get_by_id(session['user_id']) if session else None
+
+    async def sign_in(self, login: str, password: str) -> bool:
+        user = await self.user_repo.get_by_login(login)
+        if user and user.password == password:
+            self._current_user = user
+            await self.user_repo.offload(_write_session, self.session_file, user.id)
+            return True
+        return False
+
+    async def sign_out(self) -> None:
+        if self.is_authorized:
+            self._current_user = None
+            await self.user_repo.offload(_remove_session, self.session_file)
+
+    @property
+    def is_authorized(self) -> bool:
+        return self._current_user != None
+
+    @property
+    def current_user(self) -> Optional[User]:
+        return self._current_user
+
+def _read_session(session_file: str) -> Optional[dict]:
+    try:
+        with open(session_file, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+def _write_session(session_file: str, user_id: int) -> None:
+    try:
+        with open(session_file, 'w') as file:
+            json.dump({'user_id': user_id}, file)
+    except IOError as e:
+        print(e)
+
+def _remove_session(session_file: str) -> None:
+    try:
+        os.remove(session_file)
+    except FileNotFoundError as e:
+        print(e)
+
+#region Stress test
+def _stress_writer(file_path: str, first_id: int, operations: int) -> None:
+    repo = ConcurrentUserRepository(file_path)
+    for i in range(first_id, first_id + operations):
+        repo.sign_up(User(id=i, name=f"Stress {i}", login=f"stress{i}", password="pass"))
+        user = repo.get_by_id(random.randint(first_id, i))
+        user.password = f"pass{i}"
+        repo.update(user)
+
+def _stress_reader(file_path: str, repo: ConcurrentUserRepository, logins: list[str],
+                   stop: threading.Event, errors: list[str], reads: list[int]) -> None:
+    count = 0
+    while not stop.is_set():
+        for login in logins:
+            if repo.get_by_login(login) is None:
+                errors.append(f"lost user {login}")
+        try:
+            with open(file_path, 'r') as file:
+                json.load(file)
+        except json.JSONDecodeError as e:
+            errors.append(f"torn file: {e}")
+        count += len(logins)
+    reads.append(count)
+
+def stress_test(file_path: str, readers: int = 8, writer_threads: int = 4, writer_processes: int = 2,
+                operations: int = 100) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as directory: #исходный файл не должен меняться
+        copy_path = os.path.join(directory, os.path.basename(file_path))
+        if os.path.exists(file_path):
+            shutil.copy(file_path, copy_path)
+        return _stress_copy(copy_path, readers, writer_threads, writer_processes, operations)
+
+def _stress_copy(file_path: str, readers: int, writer_threads: int, writer_processes: int,
+                 operations: int) -> dict[str, Any]:
+    repo = ConcurrentUserRepository(file_path)
+    logins = [user.login for user in repo.get_all()]
+    before = repo.count()
+    stop, errors, reads = threading.Event(), [], []
+    start = time.perf_counter()
+
+    reader_threads = [threading.Thread(target=_stress_reader, args=(file_path, repo, logins, stop, errors, reads))
+                      for _ in range(readers)]
+    first_ids = [1000000 + n * operations for n in range(writer_threads + writer_processes)]
+    writers = [threading.Thread(target=_stress_writer, args=(file_path, first_id, operations))
+               for first_id in first_ids[:writer_threads]]
+    writers += [multiprocessing.Process(target=_stress_writer, args=(file_path, first_id, operations))
+                for first_id in first_ids[writer_threads:]]
+    for worker in reader_threads + writers:
+        worker.start()
+    for worker in writers:
+        worker.join()
+    stop.set()
+    for worker in reader_threads:
+        worker.join()
+
+    expected = before + len(first_ids) * operations
+    if repo.count() != expected:
+        errors.append(f"expected {expected} users, found {repo.count()}")
+    return {
+        'seconds': time.perf_counter() - start,
+        'reads': sum(reads),
+        'writes': len(first_ids) * operations * 2,
+        'users': repo.count(),
+        'errors': errors,
+    }
+#endregion
+
+#region Benchmarks
+BENCHMARK_BACKENDS: dict[str, Callable[[str], UserRepositoryProtocol]] = {
+    'json': lambda path: UserRepository(path),
+    'cached': lambda path: CachedUserRepository(path),
+    'concurrent': lambda path: ConcurrentUserRepository(path),
+    'journal': lambda path: JournalUserRepository(path),
+    'sqlite': lambda path: SqliteUserRepository(path + '.db'),
+}
+
+def generate_users(count: int, first_id: int = 0) -> list[User]:
+    return [User(id=i, name=f"User {i}", login=f"user{i}", password=f"pass{i}", email=f"user{i}@example.com")
+            for i in range(first_id, first_id + count)]
+
+def _measure(operation: Callable[[int], Any], count: int, time_budget: float) -> dict[str, float]:
+    latencies = []
+    start = time.perf_counter()
+    for i in range(count):
+        begin = time.perf_counter()
+        operation(i)
+        latencies.append(time.perf_counter() - begin)
+        if begin - start > time_budget:
+            break
+    total = time.perf_counter() - start
+    latencies.sort()
+    return {
+        'ops': len(latencies),
+        'seconds': total,
+        'ops_per_sec': len(latencies) / total if total else 0.0,
+        'mean_us': statistics.fmean(latencies) * 1e6,
+        'p50_us': latencies[len(latencies) // 2] * 1e6,
+        'p99_us': latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)] * 1e6,
+    }
+
+def benchmark_backend(backend: str, size: int, directory: str, samples: int = 200, write_samples: int = 20,
+                      batch_size: int = 1000, time_budget: float = 5.0) -> dict[str, Any]:
+    path = os.path.join(directory, f"{backend}_{size}.json")
+    with open(path, 'w') as file:
+        file.write(json.dumps([user.__dict__ for user in generate_users(size)]))
+    if backend == 'sqlite':
+        migrate_json_to_sqlite(path, path + '.db')
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    repo = BENCHMARK_BACKENDS[backend](path)
+    load_seconds = time.perf_counter() - start
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    ids = [random.randrange(size) for _ in range(samples)]
+    auth = AuthService(repo, session_file=os.path.join(directory, f"{backend}_{size}.session"))
+    new_users = generate_users(write_samples, first_id=size)
+    batch = generate_users(batch_size, first_id=size + write_samples)
+
+    def update(i: int) -> None:
+        user = new_users[i]
+        user.password = f"changed{i}"
+        repo.update(user)
+
+    operations = {
+        'get_by_id': _measure(lambda i: repo.get_by_id(ids[i]), samples, time_budget),
+        'get_by_login': _measure(lambda i: repo.get_by_login(f"user{ids[i]}"), samples, time_budget),
+        'sign_in': _measure(lambda i: auth.sign_in(f"user{ids[i]}", f"pass{ids[i]}"), samples, time_budget),
+        'sign_up': _measure(lambda i: repo.sign_up(new_users[i]), write_samples, time_budget),
+        'update': _measure(update, write_samples, time_budget),
+        'add_by_list': _measure(lambda i: repo.add_by_list(batch), 1, time_budget),
+    }
+    operations['add_by_list']['users_per_sec'] = batch_size / operations['add_by_list']['seconds']
+    if hasattr(repo, 'close'):
+        repo.close()
+    return {
+        'backend': backend,
+        'users': size,
+        'load_seconds': load_seconds,
+        'peak_memory_bytes': peak_memory,
+        'operations': operations,
+    }
+
+def run_benchmarks(sizes: Sequence[int] = (1000, 10000, 100000, 1000000),
+                   backends: Sequence[str] = tuple(BENCHMARK_BACKENDS), output: Optional[str] = None,
+                   **options) -> list[dict[str, Any]]:
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            for backend in backends:
+                result = benchmark_backend(backend, size, directory, **options)
+                print(f"{backend:>10} {size:>8}: " + ", ".join(
+                    f"{name} {stats['ops_per_sec']:.0f}/s" for name, stats in result['operations'].items()))
+                results.append(result)
+    if output:
+        with open(output, 'w') as file:
+            json.dump(results, file, indent=2)
+    return results
+#endregion
+
 #actual code
-users = [
-    User(id=0, name="Matthew Shtogrin", login="JankFank", password="qwerty12345", email="iam@jankfank.ru"),
-    User(id=1, name="Mikhail Vereshagin", login="Boss", password="bfu4life")]
-
-user_data = UserRepository(file_path='users_data.json')
-session_info = AuthService(user_data, session_file='session_data.json')
-
-user_data.add_by_list(users)
-
-#Добавление пользователя
-print("Данные до добавления")
-user_data.show_data()
-sign_up = User(id=2, name="John Doe" ,login="JD", password="examplepass")
-user_data.sign_up(sign_up)
-print()
-print("Данные после добавления")
-user_data.show_data()
-
-#Редактирование свойств пользователя
-print("\n")
-example_user = user_data.get_by_login("JD")
-print("Данные до обновления")
-print(example_user)
-example_user.name = "JohnPork"
-example_user.password = "amacallinbruh"
-user_data.update(example_user)
-print("Данные после обновления")
-print(user_data.get_by_login("JD"))
-
-#Авторизация
-print("\n")
-session_info.sign_out()
-print(f"Залогинен ли кто-то в текущей сессии?: {session_info.is_authorized}")
-while session_info.is_authorized!=True:
-    login_test, password_test = str(input("Введите (ЛОГИН:ПАРОЛЬ): ")).split(":")
-    session_info.sign_in(login_test, password_test)
+if __name__ == "__main__" and "--stress" in sys.argv:
+    print(stress_test('users_data.json'))
+elif __name__ == "__main__" and "--bench" in sys.argv:
+    #python lab5.py --bench [1000,10000] [json,cached,sqlite] [results.json]
+    arguments = sys.argv[sys.argv.index("--bench") + 1:]
+    sizes = [int(size) for size in arguments[0].split(",")] if len(arguments) > 0 else (1000, 10000, 100000, 1000000)
+    backends = arguments[1].split(",") if len(arguments) > 1 else tuple(BENCHMARK_BACKENDS)
+    run_benchmarks(sizes, backends, output=arguments[2] if len(arguments) > 2 else "bench_results.json")
+elif __name__ == "__main__":
+    users = [
+        User(id=0, name="Matthew Shtogrin", login="JankFank", password="qwerty12345", email="iam@jankfank.ru"),
+        User(id=1, name="Mikhail Vereshagin", login="Boss", password="bfu4life")]
+
+    user_data = CachedUserRepository(file_path='users_data.json')
+    session_info = AuthService(user_data, session_file='session_data.json')
+
+    user_data.add_by_list(users)
+
+    #Добавление пользователя
+    print("Данные до добавления")
+    user_data.show_data()
+    sign_up = User(id=2, name="John Doe" ,login="JD", password="examplepass")
+    user_data.sign_up(sign_up)
+    print()
+    print("Данные после добавления")
+    user_data.show_data()
+
+    #Редактирование свойств пользователя
+    print("\n")
+    example_user = user_data.get_by_login("JD")
+    print("Данные до обновления")
+    print(example_user)
+    example_user.name = "JohnPork"
+    example_user.password = "amacallinbruh"
+    user_data.update(example_user)
+    print("Данные после обновления")
+    print(user_data.get_by_login("JD"))
+
+    #Авторизация
+    print("\n")
+    session_info.sign_out()
     print(f"Залогинен ли кто-то в текущей сессии?: {session_info.is_authorized}")
+    while session_info.is_authorized!=True:
+        login_test, password_test = str(input("Введите (ЛОГИН:ПАРОЛЬ): ")).split(":")
+        session_info.sign_in(login_test, password_test)
+        print(f"Залогинен ли кто-то в текущей сессии?: {session_info.is_authorized}")
 
-#Смена текущего пользователя
-print("\n")
-print(f"Аккаунт сессии: {session_info.current_user}")
-print("Разлогин*")
-session_info.sign_out()
-print(f"Аккаунт сессии: {session_info.current_user}")
-print("Логин*")
-session_info.sign_in("Boss", "bfu4life")
-print(f"Аккаунт сессии: {session_info.current_user}")
+    #Смена текущего пользователя
+    print("\n")
+    print(f"Аккаунт сессии: {session_info.current_user}")
+    print("Разлогин*")
+    session_info.sign_out()
+    print(f"Аккаунт сессии: {session_info.current_user}")
+    print("Логин*")
+    session_info.sign_in("Boss", "bfu4life")
+    print(f"Аккаунт сессии: {session_info.current_user}")
 
+    #Несколько сессий по токенам
+    print("\n")
+    sessions = SessionAuthService(user_data, SessionStore(user_data))
+    token1 = sessions.sign_in("Boss", "bfu4life")
+    token2 = sessions.sign_in("JankFank", "qwerty12345")
+    print(f"Сессия 1: {sessions.current_user(token1)}")
+    print(f"Сессия 2: {sessions.current_user(token2)}")
+    sessions.sign_out(token1)
+    print(f"Сессия 1 после выхода: {sessions.current_user(token1)}")
 
+    #Запросы по индексам
+    print("\n")
+    print(f"Пользователи по имени: {[user.name for user in user_data.sorted_by('name')]}")
+    print(f"Имя начинается на 'm': {[user.name for user in user_data.prefix_by('name', 'm')]}")
+    print(f"По email: {user_data.find_by('email', 'iam@jankfank.ru')}")
\ No newline at end of file
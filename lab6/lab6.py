@@ -1,10 +1,8 @@
 from __future__ import annotations
-from typing import Protocol, Optional, Any, Dict
-import json
-
-text = ""
-volume = 0
-media_player = False
+from typing import Protocol, Optional, Any, Dict, Sequence
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+import json, sys, os, time, threading, weakref
 
 output_file = "output.txt"
 binds_file = "binds.json"
@@ -12,85 +10,390 @@ default_binds_file = "default_binds.json"
 
 #region Protocols
 class Command(Protocol):
-    def exec(self) -> None:
+    def exec(self, state: KeyboardState) -> None:
         ...
 
-    def undo(self) -> None:
+    def undo(self, state: KeyboardState) -> None:
         ...
 
-    def redo(self) -> None:
+    def redo(self, state: KeyboardState) -> None:
         ...
 #endregion
 
+#region Text buffer
+class TextBuffer:
+    def __init__(self, initial: str = "", capacity: int = 64) -> None:
+        capacity = max(capacity, len(initial) * 2, 1)
+        self._buffer: list[str] = list(initial) + [""] * (capacity - len(initial))
+        self._gap_start = len(initial)
+        self._gap_end = capacity
+
+    def __len__(self) -> int:
+        return len(self._buffer) - (self._gap_end - self._gap_start)
+
+    def __str__(self) -> str:
+        return "".join(self._buffer[:self._gap_start]) + "".join(self._buffer[self._gap_end:])
+
+    def __eq__(self, other) -> bool:
+        return str(self) == str(other)
+
+    def __getitem__(self, index: int | slice) -> str:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return "".join(self._buffer[self._physical(i)] for i in range(start, stop, step))
+            gap = self._gap_end - self._gap_start
+            before = self._buffer[start:min(stop, self._gap_start)]
+            after = self._buffer[max(start, self._gap_start) + gap:stop + gap] if stop > self._gap_start else []
+            return "".join(before) + "".join(after)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("TextBuffer index out of range")
+        return self._buffer[self._physical(index)]
+
+    @property
+    def cursor(self) -> int:
+        return self._gap_start
+
+    def move_cursor(self, position: int) -> None:
+        position = max(0, min(position, len(self)))
+        while self._gap_start > position:
+            self._gap_start -= 1
+            self._gap_end -= 1
+            self._buffer[self._gap_end] = self._buffer[self._gap_start]
+        while self._gap_start < position:
+            self._buffer[self._gap_start] = self._buffer[self._gap_end]
+            self._gap_start += 1
+            self._gap_end += 1
+
+    def insert(self, chars: str) -> None:
+        if self._gap_end - self._gap_start < len(chars):
+            self._grow(len(chars))
+        self._buffer[self._gap_start:self._gap_start + len(chars)] = chars
+        self._gap_start += len(chars)
+
+    def delete(self, count: int = 1) -> str:
+        count = min(count, self._gap_start)
+        self._gap_start -= count
+        return "".join(self._buffer[self._gap_start:self._gap_start + count])
+
+    def preview(self, width: int = 80) -> str:
+        if len(self) <= width:
+            return str(self)
+        return "..." + self[len(self) - width + 3:]
+
+    def _physical(self, index: int) -> int:
+        return index if index < self._gap_start else index + self._gap_end - self._gap_start
+
+    def _grow(self, needed: int) -> None:
+        extra = max(needed, len(self._buffer))
+        self._buffer[self._gap_end:self._gap_end] = [""] * extra
+        self._gap_end += extra
+#endregion
+
+class KeyboardState:
+    def __init__(self, text: str = "", volume: int = 0, media_player: bool = False) -> None:
+        self.text = TextBuffer(text)
+        self.volume = volume
+        self.media_player = media_player
+
 #region Commands
 class KeyCommand(Command):
     def __init__(self, char: str) -> None:
         self.char = char
 
-    def exec(self) -> str:
-        global text
-        text += self.char
-        return text
+    def exec(self, state: KeyboardState) -> str:
+        state.text.insert(self.char)
+        return state.text.preview()
 
-    def undo(self) -> str:
-        global text
-        text = text[:-1]
-        return text
+    def undo(self, state: KeyboardState) -> str:
+        state.text.delete(len(self.char))
+        return state.text.preview()
 
-    def redo(self) -> str:
-        return self.exec()
+    def redo(self, state: KeyboardState) -> str:
+        return self.exec(state)
 
 class VolumeUpCommand(Command):
     def __init__(self, amount: int = 20) -> None:
         self.amount = amount
 
-    def exec(self) -> str:
-        global volume
-        volume += self.amount
-        return f"volume increased +{self.amount}% ({volume}%)"
+    def exec(self, state: KeyboardState) -> str:
+        state.volume += self.amount
+        return f"volume increased +{self.amount}% ({state.volume}%)"
 
-    def undo(self) -> str:
-        global volume
-        volume -= self.amount
-        return f"volume decreased +{self.amount}% ({volume}%)"
+    def undo(self, state: KeyboardState) -> str:
+        state.volume -= self.amount
+        return f"volume decreased +{self.amount}% ({state.volume}%)"
 
-    def redo(self) -> str:
-        return self.exec()
+    def redo(self, state: KeyboardState) -> str:
+        return self.exec(state)
 
 class VolumeDownCommand(Command):
     def __init__(self, amount: int = 20) -> None:
         self.amount = amount
 
-    def exec(self) -> str:
-        global volume
-        volume -= self.amount
-        return f"volume decreased -{self.amount}% ({volume}%)"
+    def exec(self, state: KeyboardState) -> str:
+        state.volume -= self.amount
+        return f"volume decreased -{self.amount}% ({state.volume}%)"
 
-    def undo(self) -> str:
-        global volume
-        volume += self.amount
-        return f"volume increased -{self.amount}% ({volume}%)"
+    def undo(self, state: KeyboardState) -> str:
+        state.volume += self.amount
+        return f"volume increased -{self.amount}% ({state.volume}%)"
 
-    def redo(self) -> str:
-        return self.exec()
+    def redo(self, state: KeyboardState) -> str:
+        return self.exec(state)
 
 class MediaPlayerCommand(Command):
     def __init__(self) -> None:
         pass
-    def exec(self) -> str:
-        global media_player
-        media_player = True
+    def exec(self, state: KeyboardState) -> str:
+        state.media_player = True
         return "media player launched"
 
-    def undo(self) -> str:
-        global media_player
-        media_player = False
+    def undo(self, state: KeyboardState) -> str:
+        state.media_player = False
         return "media player closed"
 
-    def redo(self) -> str:
-        return self.exec()
+    def redo(self, state: KeyboardState) -> str:
+        return self.exec(state)
+#endregion
+
+#region History
+class HistoryGroup:
+    __slots__ = ('kind', 'keys', 'commands')
+
+    def __init__(self, kind: str, key: str, command: Command) -> None:
+        self.kind = kind
+        self.keys: list[str] = [key]
+        self.commands: list[Command] = [command]
+
+class History:
+    def __init__(self, max_entries: int = 1000, max_commands: int = 100000,
+                 max_run: int = 64, coalesce: bool = True) -> None:
+        self.max_entries = max_entries
+        self.max_commands = max_commands
+        self.max_run = max_run
+        self.coalesce = coalesce
+        self.back: deque[HistoryGroup] = deque()
+        self.forward: list[HistoryGroup] = []
+        self._commands = 0
+        self.dropped = 0
+
+    def __len__(self) -> int:
+        return len(self.back)
+
+    @staticmethod
+    def kind_of(command: Command) -> str:
+        if isinstance(command, KeyCommand):
+            return "typing"
+        if isinstance(command, (VolumeUpCommand, VolumeDownCommand)):
+            return "volume"
+        return "other"
+
+    def push(self, key: str, command: Command) -> None:
+        for group in self.forward:
+            self._commands -= len(group.commands)
+        self.forward.clear()
+
+        kind = self.kind_of(command)
+        last = self.back[-1] if self.back else None
+        if (self.coalesce and last is not None and last.kind == kind and kind != "other"
+                and len(last.commands) < self.max_run
+                and not (kind == "typing" and last.keys[-1].isspace() and not key.isspace())):
+            last.keys.append(key)
+            last.commands.append(command)
+        else:
+            self.back.append(HistoryGroup(kind, key, command))
+        self._commands += 1
+        self._trim()
+
+    def push_group(self, group: HistoryGroup) -> None:
+        for old in self.forward:
+            self._commands -= len(old.commands)
+        self.forward.clear()
+        self.back.append(group)
+        self._commands += len(group.commands)
+        self._trim()
+
+    def undo(self) -> Optional[HistoryGroup]:
+        if not self.back:
+            return None
+        group = self.back.pop()
+        self.forward.append(group)
+        return group
+
+    def redo(self) -> Optional[HistoryGroup]:
+        if not self.forward:
+            return None
+        group = self.forward.pop()
+        self.back.append(group)
+        return group
+
+    def clear(self) -> None:
+        self.back.clear()
+        self.forward.clear()
+        self._commands = 0
+
+    def stats(self) -> Dict[str, int]:
+        groups = list(self.back) + self.forward
+        size = sys.getsizeof(self.back) + sys.getsizeof(self.forward)
+        size += sum(sys.getsizeof(group) + sys.getsizeof(group.keys) + sys.getsizeof(group.commands)
+                    for group in groups)
+        return {
+            'entries': len(self.back),
+            'redo_entries': len(self.forward),
+            'commands': self._commands,
+            'dropped_entries': self.dropped,
+            'approx_bytes': size,
+        }
+
+    def to_state(self) -> Dict[str, list]:
+        return {
+            'back_history': [{'kind': group.kind, 'keys': group.keys} for group in self.back],
+            'forward_history': [{'kind': group.kind, 'keys': group.keys} for group in self.forward],
+        }
+
+    def load_state(self, state: Dict[str, Any], key_binds: Dict[str, Optional[Command]]) -> None:
+        self.clear()
+        self.back.extend(self._groups(state.get('back_history', []), key_binds))
+        self.forward.extend(self._groups(state.get('forward_history', []), key_binds))
+        self._commands = sum(len(group.commands) for group in list(self.back) + self.forward)
+        self._trim()
+
+    def _groups(self, entries: list, key_binds: Dict[str, Optional[Command]]) -> list[HistoryGroup]:
+        groups = []
+        for entry in entries:
+            kind = entry.get('kind') if isinstance(entry, dict) else None
+            keys = entry['keys'] if isinstance(entry, dict) else [entry] if isinstance(entry, str) else entry
+            keys = [key for key in keys if key_binds.get(key) is not None]
+            if not keys:
+                continue
+            group = HistoryGroup(kind or self.kind_of(key_binds[keys[0]]), keys[0], key_binds[keys[0]])
+            for key in keys[1:]:
+                group.keys.append(key)
+                group.commands.append(key_binds[key])
+            groups.append(group)
+        return groups
+
+    def _trim(self) -> None:
+        while len(self.back) > 1 and (len(self.back) + len(self.forward) > self.max_entries
+                             or self._commands > self.max_commands):
+            self._commands -= len(self.back.popleft().commands)
+            self.dropped += 1
 #endregion
 
+class ActionJournal:
+    def __init__(self, filename: Optional[str] = output_file, flush_every: int = 256,
+                 flush_interval: float = 1.0, echo: bool = True) -> None:
+        self.filename = filename
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.echo = echo
+        self._lines: list[str] = []
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._file = None
+        self._finalizer = weakref.finalize(self, _write_lines, self._lines, self._lock, filename)
+        if filename is not None:
+            _open_journals.add(self)
+            _start_flusher()
+
+    def write(self, line: str) -> None:
+        with self._lock:
+            self._lines.append(line + "\n")
+            if len(self._lines) >= self.flush_every or time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def write_many(self, lines: list[str]) -> None:
+        with self._lock:
+            self._lines.extend(line + "\n" for line in lines)
+            self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._lines:
+            return
+        if self.filename is None:
+            self._lines.clear()
+            return
+        try:
+            if self._file is None:
+                self._file = open(self.filename, "a")
+            self._file.write("".join(self._lines))
+            self._file.flush()
+        except IOError as e:
+            print(f"ERROR: {e}")
+        self._lines.clear()
+
+    def close(self) -> None:
+        _open_journals.discard(self)
+        with self._lock:
+            self._flush()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        self._finalizer.detach()
+
+def _write_lines(lines: list[str], lock: threading.Lock, filename: Optional[str]) -> None:
+    with lock:
+        if not lines or filename is None:
+            return
+        try:
+            with open(filename, "a") as file:
+                file.write("".join(lines))
+        except IOError as e:
+            print(f"ERROR: {e}")
+        lines.clear()
+
+_open_journals: "weakref.WeakSet[ActionJournal]" = weakref.WeakSet()
+_flusher: Optional[threading.Thread] = None
+_flusher_guard = threading.Lock()
+
+def _start_flusher() -> None:
+    global _flusher
+    with _flusher_guard:
+        if _flusher is None:
+            _flusher = threading.Thread(target=_flush_loop, daemon=True)
+            _flusher.start()
+
+def _flush_loop() -> None:
+    while True:
+        time.sleep(0.1)
+        now = time.monotonic()
+        for journal in list(_open_journals):
+            if journal._lines and now - journal._last_flush >= journal.flush_interval:
+                journal.flush()
+
+class Macro:
+    def __init__(self, keys: Optional[list[str]] = None) -> None:
+        self.keys = keys or []
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @classmethod
+    def file_load(cls, filename: str):
+        try:
+            with open(filename, "r") as f:
+                return cls(json.load(f))
+        except Exception as e:
+            print(f"ERROR: {e}")
+            return None
+
+    def file_save(self, filename: str) -> bool:
+        try:
+            with open(filename, "w") as f:
+                json.dump(self.keys, f)
+            return True
+        except Exception as e:
+            print(f"ERROR: {e}")
+            return False
+
 class Memento:
     def __init__(self, state: Dict[str, Any]) -> None:
         self.state = state
@@ -115,30 +418,97 @@ class Memento:
             return False
 
 class Keyboard:
-    def __init__(self) -> None:
+    def __init__(self, history: Optional[History] = None, checkpoint_every: int = 50,
+                 journal: Optional[ActionJournal] = None, binds_file: Optional[str] = binds_file) -> None:
+        self.state = KeyboardState()
+        self.binds_file = binds_file
         self.key_binds: dict[str, Command] = {}
-        self.back_history: list[dict[str, Command]] = []
-        self.forward_history: list[dict[str, Command]] = []
-
-        if (self._state_load(binds_file) == 1): pass
+        self.history = history if history is not None else History()
+        self.journal = journal if journal is not None else ActionJournal()
+        self.checkpoint_every = checkpoint_every
+        self._actions: list[list] = []
+        self._replaying = False
+        self._recording: Optional[list[str]] = None
+        self._checkpoint_file: Optional[str] = None
+        self._generation = 0
+        self._deltas = 0
+
+        if binds_file and self._state_load(binds_file) == 1: pass
         else: self.back_to_default_binds()
 
     def back_to_default_binds(self) -> None:
         self.logger(essential="Back to default binds")
         self._state_load(filename=default_binds_file)
-        self._state_save()
+        if self.binds_file:
+            self._state_save(full=True)
 
     def key_bind(self, key: str, command: Optional[Command]) -> None:
         self.key_binds[key] = command
+        self._record("bind", key, self._command_state(command))
+
+    def _record(self, *action: Any) -> None:
+        if not self._replaying:
+            self._actions.append(list(action))
 
     def logger(self, command: str="", message: str="", essential: str=""):
-        with open(output_file, "a") as file:
-            if message!="":file.write(message + "\n")
+        if self._replaying:
+            return
+        if message!="":self.journal.write(message)
+        if not self.journal.echo:
+            return
         if command!="":command+=": "
         if message!="":message+=" "
         print(f"{command}{message}{essential}")
 
+    def start_recording(self) -> None:
+        self._recording = []
+
+    def stop_recording(self) -> Macro:
+        macro = Macro(self._recording or [])
+        self._recording = None
+        return macro
+
+    def press_many(self, keys: Sequence[str] | Macro) -> str | None:
+        keys = list(keys.keys if isinstance(keys, Macro) else keys)
+        if not keys:
+            return None
+        if "undo" in keys or "redo" in keys:
+            result = None
+            for key in keys:
+                result = self.press(key)
+            return result
+        if self._recording is not None:
+            self._recording.extend(keys)
+
+        resolved: dict[str, Optional[Command]] = {}
+        for key in set(keys):
+            command = self.key_binds.get(key)
+            if not command and len(key) == 1:
+                command = self.key_binds[key] = KeyCommand(key)
+            if not command:
+                print(f"ERROR: Unknown key: {key}")
+            resolved[key] = command
+
+        keys = [key for key in keys if resolved[key]]
+        commands = [resolved[key] for key in keys]
+        if not commands:
+            return None
+        state = self.state
+        results = [command.exec(state) for command in commands]
+
+        group = HistoryGroup("macro", keys[0], commands[0])
+        group.keys, group.commands = keys, commands
+        self.history.push_group(group)
+        self._record("press_many", keys)
+        if not self._replaying:
+            self.journal.write_many(results)
+            if self.journal.echo:
+                print(f"macro ({len(keys)} keys): {results[-1]}")
+        return results[-1]
+
     def press(self, key: str) -> str | None:
+        if self._recording is not None and not self._replaying:
+            self._recording.append(key)
         if key == "undo":
             return self.undo()
         elif key == "redo":
@@ -146,102 +516,213 @@ class Keyboard:
 
         command = self.key_binds.get(key)
         if not command and len(key) == 1:
-            self.key_bind(key, KeyCommand(key))
+            self.key_binds[key] = KeyCommand(key)
             command = self.key_binds.get(key)
         if command:
-            result = command.exec()
-            self.back_history.append({"key": key, "command": command})
-            self.forward_history.clear()
+            result = command.exec(self.state)
+            self.history.push(key, command)
+            self._record("press", key)
             self.logger(message=result)
             return result
         print(f"ERROR: Unknown key: {key}")
         return f"Unknown key: {key}"
 
-    def undo(self) -> None:
-        if not self.back_history:
+    def undo(self) -> str | None:
+        group = self.history.undo()
+        if group is None:
             self.logger(essential = "History empty")
+            return None
+        self._record("undo")
 
-        command = self.back_history.pop()
-        result = command["command"].undo()
-        self.forward_history.append(command)
+        for command in reversed(group.commands):
+            result = command.undo(self.state)
         self.logger(command = "undo", message = result)
+        return result
 
-    def redo(self) -> str:
-        if not self.forward_history:
+    def redo(self) -> str | None:
+        group = self.history.redo()
+        if group is None:
             self.logger(essential = "History empty")
+            return None
+        self._record("redo")
 
-        command = self.forward_history.pop()
-        result = command["command"].redo()
-        self.back_history.append(command)
+        for command in group.commands:
+            result = command.redo(self.state)
         self.logger(command = "redo", message = result)
+        return result
 
     def get_state(self) -> Dict[str, Any]:
-        global text, volume, media_player
-
-        key_binds = {}
-        for key, command in self.key_binds.items():
-            if command is None:
-                key_binds[key] = None
-            else:
-                key_binds[key] = {
-                    'class': command.__class__.__name__,
-                    'state': command.__dict__.copy()
-                }
+        key_binds = {key: self._command_state(command) for key, command in self.key_binds.items()}
 
         return {
-            'text': text,
-            'volume': volume,
-            'media_player': media_player,
+            'text': str(self.state.text),
+            'volume': self.state.volume,
+            'media_player': self.state.media_player,
             'key_binds': key_binds,
-            'back_history': [cmd["key"] for cmd in self.back_history],
-            'forward_history': [cmd["key"] for cmd in self.forward_history]
+            **self.history.to_state()
         }
 
     def set_state(self, state: Dict[str, Any]) -> bool:
-        global text, volume, media_player
-
         try:
-            text = state['text']
-            volume = state['volume']
-            media_player = state['media_player']
-
-            class_names = {cls.__name__: cls for cls in Command.__subclasses__()}
+            self.state = KeyboardState(state['text'], state['volume'], state['media_player'])
 
             self.key_binds.clear()
             for key, cmd_data in state.get('key_binds', {}).items():
-                if cmd_data is None:
-                    self.key_binds[key] = None
-                else:
-                    cls = class_names[cmd_data['class']]
-                    self.key_binds[key] = cls(**cmd_data['state'])
-
-            self.back_history = [
-                {"key": key, "command": self.key_binds[key]}
-                for key in state.get('back_history', [])
-                if key in self.key_binds and self.key_binds[key] is not None
-            ]
-
-            self.forward_history = [
-                {"key": key, "command": self.key_binds[key]}
-                for key in state.get('forward_history', [])
-                if key in self.key_binds and self.key_binds[key] is not None
-            ]
+                self.key_binds[key] = self._command_from_state(cmd_data)
+
+            self.history.load_state(state, self.key_binds)
             return True
         except Exception as e:
             print(f"Error setting state: {e}")
             return False
 
-    def _state_save(self, filename: str = binds_file) -> None:
-        memento = Memento(self.get_state())
-        if memento.file_save(filename):
-            self.logger(essential="State saved")
+    def close(self) -> None:
+        self.journal.close()
+
+    @staticmethod
+    def _command_state(command: Optional[Command]) -> Optional[Dict[str, Any]]:
+        if command is None:
+            return None
+        return {'class': command.__class__.__name__, 'state': command.__dict__.copy()}
+
+    @staticmethod
+    def _command_from_state(cmd_data: Optional[Dict[str, Any]]) -> Optional[Command]:
+        if cmd_data is None:
+            return None
+        class_names = {cls.__name__: cls for cls in Command.__subclasses__()}
+        return class_names[cmd_data['class']](**cmd_data['state'])
+
+    def _state_save(self, filename: Optional[str] = None, full: bool = False) -> None:
+        filename = filename or self.binds_file
+        if not filename:
+            return
+        if (full or filename != self._checkpoint_file or self._deltas >= self.checkpoint_every
+                or not os.path.exists(filename)):
+            self._generation += 1
+            memento = Memento({**self.get_state(), 'generation': self._generation})
+            if not memento.file_save(filename):
+                return
+            try:
+                os.remove(filename + ".delta")
+            except FileNotFoundError:
+                pass
+            self._checkpoint_file = filename
+            self._deltas = 0
+        elif self._actions:
+            try:
+                with open(filename + ".delta", "a") as f:
+                    f.write(json.dumps({'generation': self._generation, 'actions': self._actions}) + "\n")
+            except IOError as e:
+                print(f"ERROR: {e}")
+                return
+            self._deltas += 1
+        self._actions = []
+        self.logger(essential="State saved")
 
     def _state_load(self, filename: str = binds_file) -> bool:
         memento = Memento.file_load(filename)
-        if memento and self.set_state(memento.state):
-            self.logger(essential="State loaded")
-            return True
-        return False
+        if not memento or not self.set_state(memento.state):
+            return False
+        self._generation = memento.state.get('generation', 0)
+        self._deltas = self._replay_deltas(filename + ".delta")
+        self._checkpoint_file = filename
+        self._actions = []
+        self.logger(essential="State loaded")
+        return True
+
+    def _replay_deltas(self, filename: str) -> int:
+        deltas = 0
+        try:
+            with open(filename, "rb") as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return 0
+        good = 0
+        self._replaying = True
+        try:
+            for line in lines:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete line")
+                    delta = json.loads(line)
+                except ValueError:
+                    break
+                good += len(line)
+                if delta['generation'] != self._generation:
+                    continue
+                for action in delta['actions']:
+                    if action[0] == "press":
+                        self.press(action[1])
+                    elif action[0] == "undo":
+                        self.undo()
+                    elif action[0] == "redo":
+                        self.redo()
+                    elif action[0] == "press_many":
+                        self.press_many(action[1])
+                    elif action[0] == "bind":
+                        self.key_binds[action[1]] = self._command_from_state(action[2])
+                deltas += 1
+        finally:
+            self._replaying = False
+        if good < sum(map(len, lines)):
+            try:
+                os.truncate(filename, good)
+            except OSError as e:
+                print(f"ERROR: {e}")
+        return deltas
+
+#region Sessions
+class KeyboardSessionManager:
+    def __init__(self, max_workers: int = 8) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.sessions: dict[str, Keyboard] = {}
+        self._locks: dict[str, threading.Lock] = {}
+
+    def open_session(self, session_id: str, **keyboard_options: Any) -> Keyboard:
+        keyboard_options.setdefault('binds_file', None)
+        keyboard_options.setdefault('journal', ActionJournal(filename=None, echo=False))
+        keyboard = Keyboard(**keyboard_options)
+        self.sessions[session_id] = keyboard
+        self._locks[session_id] = threading.Lock()
+        return keyboard
+
+    def submit(self, session_id: str, keys: Sequence[str]) -> Future:
+        return self.executor.submit(self._run, session_id, keys)
+
+    def _run(self, session_id: str, keys: Sequence[str]) -> Optional[str]:
+        keyboard = self.sessions[session_id]
+        result = None
+        with self._locks[session_id]:
+            for key in keys:
+                result = keyboard.press(key)
+        return result
+
+    def close_session(self, session_id: str) -> None:
+        with self._locks.pop(session_id):
+            self.sessions.pop(session_id).close()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        for session_id in list(self.sessions):
+            self.close_session(session_id)
+
+def benchmark_sessions(session_counts: Sequence[int] = (1, 2, 4, 8, 16), events_per_session: int = 10000,
+                       max_workers: int = 8) -> Dict[int, float]:
+    keys = ["a", "b", " ", "ctrl++", "ctrl+-", "undo", "redo"]
+    script = [keys[i % len(keys)] for i in range(events_per_session)]
+    results = {}
+    for count in session_counts:
+        manager = KeyboardSessionManager(max_workers=max_workers)
+        for i in range(count):
+            manager.open_session(f"session{i}")
+        start = time.perf_counter()
+        futures = [manager.submit(f"session{i}", script) for i in range(count)]
+        for future in futures:
+            future.result()
+        results[count] = count * events_per_session / (time.perf_counter() - start)
+        manager.close()
+    return results
+#endregion
 
 #actual code
 keyboard = Keyboard()
@@ -259,4 +740,16 @@ keyboard.press("d")
 keyboard.press("undo")
 keyboard.press("undo")
 
-keyboard._state_save()
\ No newline at end of file
+keyboard.start_recording()
+for key in "hello":
+    keyboard.press(key)
+macro = keyboard.stop_recording()
+keyboard.press_many(macro)
+keyboard.press("undo")
+
+keyboard._state_save()
+print(f"History: {keyboard.history.stats()}")
+keyboard.close()
+
+for count, events in benchmark_sessions((1, 4, 16), events_per_session=2000).items():
+    print(f"Sessions: {count}, events/sec: {events:.0f}")
\ No newline at end of file
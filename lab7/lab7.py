@@ -1,5 +1,7 @@
 ﻿from typing import Type, Generator, Any, Callable, Optional, TypeVar, Protocol
 from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+import time, threading, contextvars, builtins, asyncio, inspect
 
 T = TypeVar('T')
 
@@ -48,84 +50,532 @@ class DifferenceFromSquare(DifferenceProtocol):
         return (num-1)*num
 #endregion
 
-class Injector:
+_MISSING = object()
+
+class LazyProxy:
+    __slots__ = ('_factory', '_instance', '_lock')
+
+    def __init__(self, factory: Callable[[], Any]) -> None:
+        object.__setattr__(self, '_factory', factory)
+        object.__setattr__(self, '_instance', _MISSING)
+        object.__setattr__(self, '_lock', threading.Lock())
+
+    def _target(self) -> Any:
+        instance = object.__getattribute__(self, '_instance')
+        if instance is _MISSING:
+            with object.__getattribute__(self, '_lock'):
+                instance = object.__getattribute__(self, '_instance')
+                if instance is _MISSING:
+                    instance = object.__getattribute__(self, '_factory')()
+                    object.__setattr__(self, '_instance', instance)
+        return instance
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._target(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._target(), name, value)
+
+    def __repr__(self) -> str:
+        instance = object.__getattribute__(self, '_instance')
+        return f"<LazyProxy {'unresolved' if instance is _MISSING else repr(instance)}>"
+
+#токены входа хранятся отдельно для каждого потока/задачи
+_scope_tokens: contextvars.ContextVar[tuple] = contextvars.ContextVar("scope_tokens", default=())
+
+class Scope:
+    def __init__(self, injector: "Injector") -> None:
+        self.injector = injector
+        self.instances: dict[Type, Any] = {}
+        self.pending: dict[Type, asyncio.Future] = {}
+        self.proxies: dict[Type, LazyProxy] = {}
+        self.lock = threading.RLock()
+        self._entries = 0
+
+    def __enter__(self) -> "Scope":
+        token = self.injector._current_scope.set(self)
+        _scope_tokens.set(_scope_tokens.get() + ((self, token),))
+        with self.lock:
+            self._entries += 1
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        tokens = _scope_tokens.get()
+        position = next((i for i in range(len(tokens) - 1, -1, -1) if tokens[i][0] is self), None)
+        if position is None:
+            raise RuntimeError("Scope was not entered in this context")
+        _scope_tokens.set(tokens[:position] + tokens[position + 1:])
+        self.injector._current_scope.reset(tokens[position][1])
+        with self.lock:
+            self._entries -= 1
+            if not self._entries:
+                self.close()
+
+    def get_instance(self, protocol_type: Type[T]) -> T:
+        token = self.injector._current_scope.set(self)
+        try:
+            return self.injector.get_instance(protocol_type)
+        finally:
+            self.injector._current_scope.reset(token)
+
+    def close(self) -> None:
+        with self.lock:
+            self.instances.clear()
+            self.proxies.clear()
+
+class ResolutionStats:
     def __init__(self) -> None:
+        self.resolves: dict[Type, int] = {}
+        self.hits: dict[Type, int] = {}
+        self.misses: dict[Type, int] = {}
+        self.construction_time: dict[Type, float] = {}
+        self.chain_depth: dict[Type, int] = {}
+        self.lock = threading.Lock()
+        self._local = threading.local()
+
+    def track(self, protocol_type: Type, cached: Optional[bool], resolve: Callable[[], Any]) -> Any:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append(0)
+        start = time.perf_counter()
+        try:
+            return resolve()
+        finally:
+            elapsed = time.perf_counter() - start
+            depth = stack.pop() + 1
+            if stack:
+                stack[-1] = max(stack[-1], depth)
+            with self.lock:
+                self.resolves[protocol_type] = self.resolves.get(protocol_type, 0) + 1
+                if cached:
+                    self.hits[protocol_type] = self.hits.get(protocol_type, 0) + 1
+                else:
+                    if cached is False:
+                        self.misses[protocol_type] = self.misses.get(protocol_type, 0) + 1
+                    self.construction_time[protocol_type] = self.construction_time.get(protocol_type, 0.0) + elapsed
+                self.chain_depth[protocol_type] = max(self.chain_depth.get(protocol_type, 0), depth)
+
+    def snapshot(self) -> dict[str, dict]:
+        with self.lock:
+            result = {}
+            for protocol_type, resolves in self.resolves.items():
+                hits = self.hits.get(protocol_type, 0)
+                lookups = hits + self.misses.get(protocol_type, 0)
+                constructions = resolves - hits
+                result[protocol_type.__name__] = {
+                    'resolves': resolves,
+                    'hit_rate': hits / lookups if lookups else None,
+                    'constructions': constructions,
+                    'construction_time': self.construction_time.get(protocol_type, 0.0),
+                    'avg_construction_time': (self.construction_time.get(protocol_type, 0.0) / constructions
+                                              if constructions else 0.0),
+                    'chain_depth': self.chain_depth[protocol_type]
+                }
+            return result
+
+    def reset(self) -> None:
+        with self.lock:
+            for counters in (self.resolves, self.hits, self.misses, self.construction_time, self.chain_depth):
+                counters.clear()
+
+def _required_parameters(class_type: Type) -> Optional[set[str]]:
+    try:
+        parameters = inspect.signature(class_type).parameters
+    except (TypeError, ValueError):
+        return None
+    if any(p.kind == p.VAR_KEYWORD for p in parameters.values()):
+        explicit = {name for name, p in parameters.items() if p.default is not p.empty}
+        return {name for name in getattr(class_type, '__annotations__', {}) if name not in explicit}
+    return {name for name, p in parameters.items()
+            if p.default is p.empty and p.kind not in (p.VAR_POSITIONAL, p.VAR_KEYWORD)}
+
+class Injector:
+    def __init__(self, instrument: bool = False) -> None:
         self._registrations: dict[Type, dict] = {}
         self._singleton_instances: dict[Type, Any] = {}
-        self._scoped_instances: dict[Type, Any] = {}
-        self._in_scope = False
+        self._singleton_locks: dict[Type, threading.RLock] = {}
+        self._pending_singletons: dict[Type, asyncio.Future] = {}
+        self._singleton_proxies: dict[Type, LazyProxy] = {}
+        self._locks_guard = threading.Lock()
+        self._root_scope = Scope(self)
+        self._current_scope: contextvars.ContextVar[Optional[Scope]] = contextvars.ContextVar(
+            f"injector_scope_{id(self)}", default=None)
+        self._stats: Optional[ResolutionStats] = ResolutionStats() if instrument else None
+
+    def instrument(self, enabled: bool = True) -> None:
+        if not enabled:
+            self._stats = None
+        elif self._stats is None:
+            self._stats = ResolutionStats()
+
+    def snapshot(self) -> dict[str, dict]:
+        return self._stats.snapshot() if self._stats is not None else {}
 
     def register(self,
                  protocol_type: Type[T],
                  class_type: Optional[Type] = None,
                  life_style: str = LifeStyle.PER_REQUEST,
                  factory_method: Optional[Callable] = None,
-                 params: Optional[dict] = None) -> None:
+                 params: Optional[dict] = None,
+                 lazy: bool = False) -> None:
 
         if factory_method and class_type:
             raise ValueError()
 
+        for registration in self._registrations.values():
+            registration['plan'] = None
+        self._singleton_proxies.pop(protocol_type, None)
         self._registrations[protocol_type] = {
             'class_type': class_type,
             'life_style': life_style,
             'params': params or {},
-            'factory_method': factory_method
+            'factory_method': factory_method,
+            'is_async': inspect.iscoroutinefunction(factory_method),
+            'lazy': lazy,
+            'plan': None
         }
 
+    def create_scope(self) -> Scope:
+        return Scope(self)
+
     @contextmanager
-    def scope(self) -> Generator[None, Any, None]:
-        if self._in_scope:
-            yield
+    def scope(self, nested: bool = False) -> Generator[Scope, Any, None]:
+        current = self._current_scope.get()
+        if current is not None and not nested:
+            yield current
             return
 
-        self._in_scope = True
-        self._scoped_instances.clear()
-        try:
-            yield
-        finally:
-            self._in_scope = False
-            self._scoped_instances.clear()
+        with Scope(self) as scope:
+            yield scope
 
     def get_instance(self, protocol_type: Type[T]) -> T:
         if protocol_type not in self._registrations:
             raise ValueError(f"No registration found for {protocol_type.__name__}")
 
         registration = self._registrations[protocol_type]
+        if registration['is_async']:
+            raise TypeError(f"{protocol_type.__name__} has an async factory, use get_instance_async")
+        if registration['lazy']:
+            return self._lazy_proxy(protocol_type, registration)
+        return self._resolve(protocol_type, registration)
+
+    def _lazy_proxy(self, protocol_type: Type, registration: dict) -> "LazyProxy":
+        scope = self._current_scope.get()
+        proxy = LazyProxy(lambda: self._resolve_in(scope, protocol_type, registration))
+        if registration['life_style'] == LifeStyle.SINGLETON:
+            return self._singleton_proxies.setdefault(protocol_type, proxy)
+        if registration['life_style'] == LifeStyle.SCOPED:
+            return (scope or self._root_scope).proxies.setdefault(protocol_type, proxy)
+        return proxy
+
+    def _resolve_in(self, scope: Optional[Scope], protocol_type: Type, registration: dict) -> Any:
+        token = self._current_scope.set(scope)
+        try:
+            return self._resolve(protocol_type, registration)
+        finally:
+            self._current_scope.reset(token)
+
+    def _resolve(self, protocol_type: Type, registration: dict) -> Any:
+        stats = self._stats
+        if stats is not None:
+            life_style = registration['life_style']
+            cached = None
+            if life_style == LifeStyle.SINGLETON:
+                cached = protocol_type in self._singleton_instances
+            elif life_style == LifeStyle.SCOPED:
+                cached = protocol_type in (self._current_scope.get() or self._root_scope).instances
+            return stats.track(protocol_type, cached, lambda: self._resolve_cached(protocol_type, registration))
+        return self._resolve_cached(protocol_type, registration)
+
+    def _resolve_cached(self, protocol_type: Type, registration: dict) -> Any:
         life_style = registration['life_style']
 
         if life_style == LifeStyle.SINGLETON:
-            if protocol_type in self._singleton_instances:
-                return self._singleton_instances[protocol_type]
-
-            instance = self.create_instance(registration)
-            self._singleton_instances[protocol_type] = instance
+            instance = self._singleton_instances.get(protocol_type, _MISSING)
+            if instance is not _MISSING:
+                return instance
+
+            with self._singleton_lock(protocol_type):
+                instance = self._singleton_instances.get(protocol_type, _MISSING)
+                if instance is _MISSING:
+                    instance = self.create_instance(registration)
+                    self._singleton_instances[protocol_type] = instance
             return instance
 
         if life_style == LifeStyle.SCOPED:
-            if protocol_type in self._scoped_instances:
-                return self._scoped_instances[protocol_type]
-
-            instance = self.create_instance(registration)
-            self._scoped_instances[protocol_type] = instance
+            scope = self._current_scope.get() or self._root_scope
+            instance = scope.instances.get(protocol_type, _MISSING)
+            if instance is not _MISSING:
+                return instance
+
+            with scope.lock:
+                instance = scope.instances.get(protocol_type, _MISSING)
+                if instance is _MISSING:
+                    instance = self.create_instance(registration)
+                    scope.instances[protocol_type] = instance
             return instance
 
         return self.create_instance(registration)
 
-    def create_instance(self, registration: dict) -> Any:
-        if registration['factory_method']:
-            return registration['factory_method']()
+    async def get_instance_async(self, protocol_type: Type[T]) -> T:
+        if protocol_type not in self._registrations:
+            raise ValueError(f"No registration found for {protocol_type.__name__}")
 
-        class_type = registration['class_type']
-        params = registration['params'].copy()
+        registration = self._registrations[protocol_type]
+        life_style = registration['life_style']
+        if life_style == LifeStyle.SINGLETON:
+            return await self._get_or_create_async(
+                self._singleton_instances, self._pending_singletons, protocol_type, registration)
+        if life_style == LifeStyle.SCOPED:
+            scope = self._current_scope.get() or self._root_scope
+            return await self._get_or_create_async(scope.instances, scope.pending, protocol_type, registration)
+        return await self.create_instance_async(registration)
+
+    async def _get_or_create_async(self, instances: dict, pending: dict, protocol_type: Type, registration: dict) -> Any:
+        instance = instances.get(protocol_type, _MISSING)
+        if instance is not _MISSING:
+            return instance
+        future = pending.get(protocol_type)
+        if future is None:
+            future = pending[protocol_type] = asyncio.ensure_future(self.create_instance_async(registration))
+            try:
+                instances[protocol_type] = await future
+            finally:
+                pending.pop(protocol_type, None)
+        return await future
+
+    async def create_instance_async(self, registration: dict) -> Any:
+        constructor, dependencies, params = registration['plan'] or self._compile_plan(registration)
         constructor_params = {}
-        if hasattr(class_type, '__annotations__'):
-            for param_name, param_type in class_type.__annotations__.items():
-                if param_name != 'return' and param_type in self._registrations:
-                    constructor_params[param_name] = self.get_instance(param_type)
+        if dependencies:
+            values = await asyncio.gather(*(self.get_instance_async(param_type) for _, param_type in dependencies))
+            constructor_params = {param_name: value for (param_name, _), value in zip(dependencies, values)}
+        constructor_params.update(params)
+        instance = constructor(**constructor_params)
+        if inspect.isawaitable(instance):
+            instance = await instance
+        return instance
+
+    def _singleton_lock(self, protocol_type: Type) -> threading.RLock:
+        lock = self._singleton_locks.get(protocol_type)
+        if lock is None:
+            with self._locks_guard:
+                lock = self._singleton_locks.setdefault(protocol_type, threading.RLock())
+        return lock
+
+    def create_instance(self, registration: dict) -> Any:
+        plan = registration['plan'] or self._compile_plan(registration)
+        constructor, dependencies, params = plan
+        if not dependencies:
+            return constructor(**params) if params else constructor()
 
+        constructor_params = {param_name: self.get_instance(param_type) for param_name, param_type in dependencies}
         constructor_params.update(params)
+        return constructor(**constructor_params)
 
-        return class_type(**constructor_params)
+    def dependencies_of(self, protocol_type: Type) -> list[Type]:
+        registration = self._registrations[protocol_type]
+        plan = registration['plan'] or self._compile_plan(registration)
+        return [param_type for _, param_type in plan[1]]
+
+    def validate(self) -> dict[Type, list[Type]]:
+        errors = []
+        graph = {}
+        for protocol_type, registration in self._registrations.items():
+            if not registration['factory_method'] and registration['class_type'] is None:
+                errors.append(f"{protocol_type.__name__} has neither a class nor a factory")
+                continue
+            graph[protocol_type] = self.dependencies_of(protocol_type)
+            if registration['factory_method']:
+                continue
+            required = _required_parameters(registration['class_type'])
+            for param_name, param_type in getattr(registration['class_type'], '__annotations__', {}).items():
+                if (param_name != 'return' and isinstance(param_type, type)
+                        and (required is None or param_name in required)
+                        and param_type not in self._registrations and param_name not in registration['params']
+                        and getattr(builtins, param_type.__name__, None) is not param_type):
+                    errors.append(f"{protocol_type.__name__}.{param_name} needs {param_type.__name__}, which is not registered")
+
+        visiting, done = set(), set()
+        def visit(node: Type, path: list[Type]) -> None:
+            if node in done or node not in graph:
+                return
+            if node in visiting:
+                cycle = path[path.index(node):] + [node]
+                errors.append("Dependency cycle: " + " -> ".join(t.__name__ for t in cycle))
+                return
+            visiting.add(node)
+            for dependency in graph[node]:
+                visit(dependency, path + [node])
+            visiting.discard(node)
+            done.add(node)
+        for node in graph:
+            visit(node, [])
+
+        if errors:
+            raise ValueError("Invalid registrations:\n" + "\n".join(errors))
+        return graph
+
+    def _startup_order(self) -> tuple[list[list[Type]], set[Type]]:
+        graph = self.validate()
+        levels: dict[Type, int] = {}
+        needs_async: set[Type] = set()
+        def level(node: Type) -> int:
+            if node not in levels:
+                levels[node] = 1 + max((level(dependency) for dependency in graph[node]), default=-1)
+                if self._registrations[node]['is_async'] or any(d in needs_async for d in graph[node]):
+                    needs_async.add(node)
+            return levels[node]
+        for node in graph:
+            level(node)
+
+        singletons = [t for t in graph if self._registrations[t]['life_style'] == LifeStyle.SINGLETON]
+        depths = sorted({levels[t] for t in singletons})
+        return [[t for t in singletons if levels[t] == depth] for depth in depths], needs_async
+
+    def build(self, max_workers: int = 4) -> dict[Type, float]:
+        order, needs_async = self._startup_order()
+        timings: dict[Type, float] = {}
+        def create(protocol_type: Type) -> None:
+            start = time.perf_counter()
+            self.get_instance(protocol_type)
+            timings[protocol_type] = time.perf_counter() - start
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for singletons in order:
+                list(executor.map(create, [t for t in singletons if t not in needs_async]))
+        self.startup_skipped = [t for singletons in order for t in singletons if t in needs_async]
+        self.startup_timings = timings
+        return timings
+
+    async def build_async(self) -> dict[Type, float]:
+        order, _ = self._startup_order()
+        timings: dict[Type, float] = {}
+        async def create(protocol_type: Type) -> None:
+            start = time.perf_counter()
+            await self.get_instance_async(protocol_type)
+            timings[protocol_type] = time.perf_counter() - start
+
+        for singletons in order:
+            await asyncio.gather(*(create(t) for t in singletons))
+        self.startup_skipped = []
+        self.startup_timings = timings
+        return timings
+
+    def _compile_plan(self, registration: dict) -> tuple[Callable, tuple, dict]:
+        if registration['factory_method']:
+            plan = (registration['factory_method'], (), {})
+        else:
+            class_type = registration['class_type']
+            dependencies = tuple(
+                (param_name, param_type)
+                for param_name, param_type in getattr(class_type, '__annotations__', {}).items()
+                if param_name != 'return' and param_type in self._registrations
+                and param_name not in registration['params'])
+            plan = (class_type, dependencies, registration['params'])
+        registration['plan'] = plan
+        return plan
+
+#region Benchmarks
+def _create_instance_without_plan(injector: Injector, registration: dict) -> Any:
+    if registration['factory_method']:
+        return registration['factory_method']()
+
+    class_type = registration['class_type']
+    params = registration['params'].copy()
+    constructor_params = {}
+    if hasattr(class_type, '__annotations__'):
+        for param_name, param_type in class_type.__annotations__.items():
+            if param_name != 'return' and param_type in injector._registrations:
+                constructor_params[param_name] = injector.get_instance(param_type)
+
+    constructor_params.update(params)
+
+    return class_type(**constructor_params)
+
+def benchmark_resolution_plans(count: int = 100000) -> dict[str, float]:
+    class Leaf:
+        pass
+
+    class Node:
+        left: Leaf
+        right: Leaf
+
+        def __init__(self, left: Leaf, right: Leaf, weight: float) -> None:
+            self.left, self.right, self.weight = left, right, weight
+
+    injector = Injector()
+    injector.register(Leaf, Leaf)
+    injector.register(Node, Node, params={'weight': 1.0})
+    registration = injector._registrations[Node]
+
+    results = {}
+    start = time.perf_counter()
+    for _ in range(count):
+        _create_instance_without_plan(injector, registration)
+    results['without_plan'] = (time.perf_counter() - start) / count * 1e9
+    start = time.perf_counter()
+    for _ in range(count):
+        injector.create_instance(registration)
+    results['with_plan'] = (time.perf_counter() - start) / count * 1e9
+    return results
+
+def _synthetic_graph(width: int, depth: int) -> tuple[Type, list[Type]]:
+    def make(name: str, dependencies: list[Type]) -> Type:
+        def __init__(self, **dependencies: Any) -> None:
+            self.__dict__.update(dependencies)
+        annotations = {f"dependency{i}": dependency for i, dependency in enumerate(dependencies)}
+        return type(name, (), {'__annotations__': annotations, '__init__': __init__})
+
+    types, heads = [], []
+    for column in range(width):
+        node = None
+        for level in range(depth, 0, -1):
+            node = make(f"Node{column}_{level}", [node] if node else [])
+            types.append(node)
+        heads.append(node)
+    root = make("Root", heads)
+    types.append(root)
+    return root, types
+
+def _throughput(action: Callable[[], Any], count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        action()
+    return count / (time.perf_counter() - start)
+
+def benchmark_injector(widths: tuple[int, ...] = (1, 4, 16),
+                       depths: tuple[int, ...] = (1, 4, 8),
+                       count: int = 2000) -> list[dict]:
+    results = []
+    for width in widths:
+        for depth in depths:
+            root, types = _synthetic_graph(width, depth)
+            row = {'width': width, 'depth': depth}
+            for life_style in (LifeStyle.PER_REQUEST, LifeStyle.SCOPED, LifeStyle.SINGLETON):
+                injector = Injector()
+                for service in types:
+                    injector.register(service, service, life_style)
+                with injector.scope():
+                    row[life_style] = _throughput(lambda: injector.get_instance(root), count)
+                if life_style == LifeStyle.SCOPED:
+                    def fresh_scope() -> None:
+                        with injector.scope(nested=True):
+                            injector.get_instance(root)
+                    row['scoped_fresh'] = _throughput(fresh_scope, count)
+                elif life_style == LifeStyle.PER_REQUEST:
+                    injector.instrument()
+                    row['per_request_instrumented'] = _throughput(lambda: injector.get_instance(root), count)
+
+            injector = Injector()
+            def empty_scope() -> None:
+                with injector.scope(nested=True):
+                    pass
+            row['scope_enter_exit_ns'] = 1e9 / _throughput(empty_scope, count)
+            results.append(row)
+    return results
+#endregion
 
 #actual code
 injector = Injector()
@@ -205,4 +655,55 @@ with injector.scope():
     co2 = injector.get_instance(ExampleClass)
     print(f"Сравнение Scoped: {co1 == co2}")
 co3 = injector.get_instance(ExampleClass)
-print(f"Сравнение Scoped: {co1 == co3}")
\ No newline at end of file
+print(f"Сравнение Scoped: {co1 == co3}")
+
+print()
+print("Время разрешения зависимостей")
+for name, ns in benchmark_resolution_plans(20000).items():
+    print(f"{name}: {ns:.0f} нс")
+
+print()
+print("Проверка и прогрев синглтонов")
+for service, seconds in injector.build().items():
+    print(f"{service.__name__}: {seconds * 1000:.3f} мс")
+
+print()
+print("Ленивые зависимости и асинхронные фабрики")
+def heavy_service():
+    print("(создание тяжёлого сервиса)", end=' ')
+    return Square()
+lazy_injector = Injector()
+lazy_injector.register(MultiplyProtocol, factory_method=heavy_service, life_style=LifeStyle.SINGLETON, lazy=True)
+lazy_mult = lazy_injector.get_instance(MultiplyProtocol)
+print(lazy_mult)
+print(lazy_mult.exec(4))
+
+async def async_service():
+    await asyncio.sleep(0.01)
+    return DifferenceFromFive()
+lazy_injector.register(DifferenceProtocol, factory_method=async_service, life_style=LifeStyle.SINGLETON)
+print(asyncio.run(lazy_injector.get_instance_async(DifferenceProtocol)).exec(2))
+
+print()
+print("Статистика разрешения зависимостей")
+class Calculator(ExampleClass):
+    multiplier: MultiplyProtocol
+
+stats_injector = Injector(instrument=True)
+stats_injector.register(MultiplyProtocol, MultiplyByFive, LifeStyle.SINGLETON)
+stats_injector.register(Calculator, Calculator, LifeStyle.SCOPED, params={'mult': 2.0})
+for _ in range(3):
+    with stats_injector.scope():
+        stats_injector.get_instance(Calculator)
+        stats_injector.get_instance(Calculator)
+for service, info in stats_injector.snapshot().items():
+    print(f"{service}: запросов {info['resolves']}, попаданий в кэш {info['hit_rate']:.0%}, "
+          f"создано {info['constructions']}, глубина {info['chain_depth']}")
+
+print()
+print("Пропускная способность (разрешений в секунду)")
+for row in benchmark_injector(widths=(1, 8), depths=(1, 8), count=500):
+    print(f"ширина {row['width']}, глубина {row['depth']}: "
+          f"PerRequest {row[LifeStyle.PER_REQUEST]:.0f}, Scoped {row[LifeStyle.SCOPED]:.0f}, "
+          f"Singleton {row[LifeStyle.SINGLETON]:.0f}, новый scope {row['scoped_fresh']:.0f}, "
+          f"вход/выход из scope {row['scope_enter_exit_ns']:.0f} нс")
\ No newline at end of file